@@ -1,35 +1,116 @@
+import asyncio
+import weakref
+import orjson
+from contextlib import asynccontextmanager
+from cachetools import TTLCache
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Dict
+from redis.exceptions import LockError
+from app.core.cache import get_redis
+from app.core.config import settings
 from app.services.airfoil_agent_free import FreeAirfoilAgent
 
 router = APIRouter()
-sessions: Dict[str, FreeAirfoilAgent] = {}
+# Fallback store used when REDIS_URL is not configured; bounded so unique
+# session ids can't grow it forever, idle agents expire like Redis keys do
+sessions: Dict[str, FreeAirfoilAgent] = TTLCache(maxsize=settings.MAX_SESSIONS, ttl=settings.SESSION_TTL_SECONDS)
+
+# Per-session locks so concurrent commands for one session can't race on the
+# agent, while different sessions still run in parallel. These only serialize
+# requests within this process; across workers/instances _session_guard adds
+# a Redis lock. Weak values drop a lock once no request holds it; lookup and
+# insert happen without an await in between, so no global lock is needed.
+_session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+# Redis lock expiry (a crashed holder can't block the session for longer)
+# and how long a command waits for another worker's command to finish
+SESSION_LOCK_TTL_SECONDS = 30
+SESSION_LOCK_WAIT_SECONDS = 10
 
 class CommandRequest(BaseModel):
     command: str
     session_id: str = "default"
 
-def get_agent(session_id: str) -> FreeAirfoilAgent:
-    if session_id not in sessions:
-        sessions[session_id] = FreeAirfoilAgent()
-    return sessions[session_id]
+def _session_key(session_id: str) -> str:
+    return f"agent:{session_id}"
+
+def _session_lock(session_id: str) -> asyncio.Lock:
+    lock = _session_locks.get(session_id)
+    if lock is None:
+        lock = _session_locks[session_id] = asyncio.Lock()
+    return lock
+
+@asynccontextmanager
+async def _session_guard(session_id: str):
+    """Hold a session exclusively for a load -> run -> save cycle"""
+    async with _session_lock(session_id):
+        redis = get_redis()
+        if redis is None:
+            yield
+            return
+        # SET NX with a TTL, so workers and instances sharing Redis take turns
+        lock = redis.lock(
+            f"lock:{_session_key(session_id)}",
+            timeout=SESSION_LOCK_TTL_SECONDS,
+            blocking_timeout=SESSION_LOCK_WAIT_SECONDS
+        )
+        if not await lock.acquire():
+            raise HTTPException(status_code=503, detail="Session is busy, try again")
+        try:
+            yield
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                pass  # expired while held; another request may own it now
+
+async def get_agent(session_id: str) -> FreeAirfoilAgent:
+    redis = get_redis()
+    if redis is None:
+        if session_id not in sessions:
+            sessions[session_id] = FreeAirfoilAgent()
+        return sessions[session_id]
+    data = await redis.get(_session_key(session_id))
+    if data is not None:
+        try:
+            return FreeAirfoilAgent.from_json(data)
+        except orjson.JSONDecodeError:
+            pass  # unreadable (e.g. written by an older release); start over
+    return FreeAirfoilAgent()
+
+async def save_agent(session_id: str, agent: FreeAirfoilAgent):
+    redis = get_redis()
+    if redis is not None:
+        await redis.set(_session_key(session_id), agent.to_json(), ex=settings.SESSION_TTL_SECONDS)
 
 @router.post("/command")
 async def process_command(request: CommandRequest):
-    agent = get_agent(request.session_id)
-    result = agent.process_command(request.command)
+    # Held across load -> run -> save so Redis write-backs don't lose updates
+    async with _session_guard(request.session_id):
+        agent = await get_agent(request.session_id)
+        # NeuralFoil work inside the agent is blocking; keep it off the event loop
+        result = await run_in_threadpool(agent.process_command, request.command)
+        # Saved even when the command failed, so nothing it changed is lost
+        await save_agent(request.session_id, agent)
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
-    return result
+    # Generated coordinates are an ndarray; hand them to orjson directly
+    # rather than through jsonable_encoder
+    return ORJSONResponse(result)
 
 @router.get("/current")
 async def get_current_airfoil(session_id: str = "default"):
-    agent = get_agent(session_id)
+    agent = await get_agent(session_id)
     if agent.current_airfoil is None:
         raise HTTPException(status_code=404, detail="No airfoil generated")
-    return {"coordinates": agent.current_airfoil.tolist()}
+    # orjson serializes the ndarray natively (OPT_SERIALIZE_NUMPY), no tolist()
+    return ORJSONResponse({"coordinates": agent.current_airfoil})
 
 @router.get("/health")
 async def health_check():
-    return {"status": "healthy", "sessions": len(sessions)}
+    sessions.expire()
+    store = "redis" if get_redis() is not None else "memory"
+    return {"status": "healthy", "sessions": len(sessions), "session_store": store}
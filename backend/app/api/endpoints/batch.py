@@ -0,0 +1,128 @@
+"""
+Batch gateway: run several API calls from one HTTP round trip
+"""
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_BATCH_REQUESTS = 20
+
+
+class BatchItem(BaseModel):
+    """One sub-request; url is a path on this API (e.g. /api/v1/simulations/run)"""
+    id: str
+    method: str = "GET"
+    url: str
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(..., max_length=MAX_BATCH_REQUESTS)
+
+
+async def _call_app(request: Request, item: BatchItem) -> Dict[str, Any]:
+    """
+    Dispatch one sub-request through the ASGI app in-process
+
+    The sub-request goes through the same routing, validation and handlers
+    as a direct call, but skips the network, TLS and CORS preflight.
+    """
+    path, _, query = item.url.partition("?")
+    payload = orjson.dumps(item.body) if item.body is not None else b""
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": item.method.upper(),
+        "scheme": request.scope.get("scheme", "http"),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+            # client_address may read the caller from these (TRUSTED_PROXY_HOPS)
+            *((b"x-forwarded-for", value) for name, value in request.scope["headers"] if name == b"x-forwarded-for"),
+        ],
+        # Keep the caller's address so per-client limits still apply
+        "client": request.scope.get("client"),
+        "server": request.scope.get("server"),
+    }
+
+    body_sent = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        # Streaming responses listen for a disconnect; only report one once we're done
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    status = 500
+    content_type = b""
+    chunks = []
+
+    async def send(message):
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # Unhandled errors are re-raised after the constant 500 body is sent;
+        # log the details here and pass that body on, never the exception text
+        logger.exception("Batch sub-request %s %s failed", item.method.upper(), path)
+        if not chunks:
+            return {"id": item.id, "status": 500, "body": {"detail": "Internal server error"}}
+    finally:
+        finished.set()
+
+    raw = b"".join(chunks)
+    if content_type.startswith(b"application/json") and raw:
+        body = orjson.loads(raw)
+    else:
+        body = raw.decode(errors="replace")
+
+    return {"id": item.id, "status": status, "body": body}
+
+
+@router.post("")
+async def run_batch(batch: BatchRequest, request: Request):
+    """
+    Run up to MAX_BATCH_REQUESTS API calls concurrently
+
+    Example request:
+    ```json
+    {
+        "requests": [
+            {"id": "a", "method": "POST", "url": "/api/v1/simulations/run",
+             "body": {"airfoil_type": "naca", "naca_designation": "2412", "alpha": 4}},
+            {"id": "b", "method": "GET", "url": "/api/v1/simulations/presets"}
+        ]
+    }
+    ```
+    """
+    batch_path = request.url.path
+    for item in batch.requests:
+        if item.url.partition("?")[0].rstrip("/") == batch_path.rstrip("/"):
+            raise HTTPException(400, "Batch requests cannot be nested")
+
+    responses = await asyncio.gather(*(_call_app(request, item) for item in batch.requests))
+    return ORJSONResponse({"responses": responses})
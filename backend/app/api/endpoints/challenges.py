@@ -1,10 +1,12 @@
 """
 CFD LeetCode - Challenge System
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 from typing import List, Optional, Dict
+import operator
 import random
+import orjson
 
 router = APIRouter()
 
@@ -102,6 +104,21 @@ CHALLENGES = {
     }
 }
 
+# Submission checks in feedback order:
+# (constraint key, submission field, fails(value, limit), fail message, pass message)
+SUBMISSION_CHECKS = (
+    ("target_cl_min", "cl", operator.lt,
+     "❌ CL too low: {value:.4f} < {limit}", "✅ CL requirement met: {value:.4f}"),
+    ("target_cl_max", "cl", operator.gt,
+     "❌ CL too high: {value:.4f} > {limit}", None),
+    ("target_cd_max", "cd", operator.gt,
+     "❌ CD too high: {value:.6f} > {limit}", "✅ Drag requirement met: {value:.6f}"),
+    ("target_ld_min", "ld", operator.lt,
+     "❌ L/D too low: {value:.1f} < {limit}", "✅ L/D requirement met: {value:.1f}"),
+    ("alpha", "alpha", lambda value, limit: abs(value - limit) > 0.1,
+     "❌ Must use α = {limit}°", None),
+)
+
 class ChallengeResponse(BaseModel):
     challenge: Dict
     message: str
@@ -120,35 +137,52 @@ class SubmissionResponse(BaseModel):
     points: int
     feedback: str
 
+# CHALLENGES is static, so the list response is serialized once at import
+CHALLENGE_LIST = {
+    "challenges": [
+        {
+            "id": c["id"],
+            "title": c["title"],
+            "difficulty": c["difficulty"],
+            "description": c["description"],
+            "points": c["points"]
+        }
+        for c in CHALLENGES.values()
+    ]
+}
+_CHALLENGE_LIST_BYTES = orjson.dumps(CHALLENGE_LIST)
+
 @router.get("/list")
 async def list_challenges():
     """Get all available challenges"""
-    return {
-        "challenges": [
-            {
-                "id": c["id"],
-                "title": c["title"],
-                "difficulty": c["difficulty"],
-                "description": c["description"],
-                "points": c["points"]
-            }
-            for c in CHALLENGES.values()
-        ]
-    }
+    return Response(content=_CHALLENGE_LIST_BYTES, media_type="application/json")
+
+# One prebuilt response body per challenge; they never change at runtime
+_CHALLENGE_RESPONSES = {
+    challenge_id: ChallengeResponse(
+        challenge=challenge,
+        message=f"Challenge: {challenge['title']} ({challenge['difficulty']})\n\n{challenge['description']}"
+    ).model_dump_json().encode()
+    for challenge_id, challenge in CHALLENGES.items()
+}
+
+_CHALLENGE_IDS = tuple(CHALLENGES)
 
-@router.get("/{challenge_id}")
+# Declared before /{challenge_id} so "random" isn't captured as an id
+@router.get("/random", response_model=ChallengeResponse)
+async def get_random_challenge():
+    """Get a random challenge"""
+    return Response(content=_CHALLENGE_RESPONSES[random.choice(_CHALLENGE_IDS)], media_type="application/json")
+
+@router.get("/{challenge_id}", response_model=ChallengeResponse)
 async def get_challenge(challenge_id: str):
     """Get a specific challenge"""
-    if challenge_id not in CHALLENGES:
+    body = _CHALLENGE_RESPONSES.get(challenge_id)
+    if body is None:
         raise HTTPException(404, f"Challenge '{challenge_id}' not found")
-    
-    challenge = CHALLENGES[challenge_id]
-    return ChallengeResponse(
-        challenge=challenge,
-        message=f"Challenge: {challenge['title']} ({challenge['difficulty']})\n\n{challenge['description']}"
-    )
+    return Response(content=body, media_type="application/json")
 
-@router.post("/submit")
+@router.post("/submit", response_model=SubmissionResponse)
 async def submit_solution(submission: SubmissionRequest):
     """Submit a solution to a challenge"""
     if submission.challenge_id not in CHALLENGES:
@@ -161,40 +195,16 @@ async def submit_solution(submission: SubmissionRequest):
     feedback_parts = []
     success = True
     
-    # Check CL
-    if "target_cl_min" in constraints:
-        if submission.cl < constraints["target_cl_min"]:
-            success = False
-            feedback_parts.append(f"❌ CL too low: {submission.cl:.4f} < {constraints['target_cl_min']}")
-        else:
-            feedback_parts.append(f"✅ CL requirement met: {submission.cl:.4f}")
-    
-    if "target_cl_max" in constraints:
-        if submission.cl > constraints["target_cl_max"]:
+    for key, field, fails, fail_message, pass_message in SUBMISSION_CHECKS:
+        limit = constraints.get(key)
+        if limit is None:
+            continue
+        value = getattr(submission, field)
+        if fails(value, limit):
             success = False
-            feedback_parts.append(f"❌ CL too high: {submission.cl:.4f} > {constraints['target_cl_max']}")
-    
-    # Check CD
-    if "target_cd_max" in constraints:
-        if submission.cd > constraints["target_cd_max"]:
-            success = False
-            feedback_parts.append(f"❌ CD too high: {submission.cd:.6f} > {constraints['target_cd_max']}")
-        else:
-            feedback_parts.append(f"✅ Drag requirement met: {submission.cd:.6f}")
-    
-    # Check L/D
-    if "target_ld_min" in constraints:
-        if submission.ld < constraints["target_ld_min"]:
-            success = False
-            feedback_parts.append(f"❌ L/D too low: {submission.ld:.1f} < {constraints['target_ld_min']}")
-        else:
-            feedback_parts.append(f"✅ L/D requirement met: {submission.ld:.1f}")
-    
-    # Check alpha range
-    if "alpha" in constraints:
-        if abs(submission.alpha - constraints["alpha"]) > 0.1:
-            success = False
-            feedback_parts.append(f"❌ Must use α = {constraints['alpha']}°")
+            feedback_parts.append(fail_message.format(value=value, limit=limit))
+        elif pass_message:
+            feedback_parts.append(pass_message.format(value=value, limit=limit))
     
     feedback = "\n".join(feedback_parts)
     
@@ -205,15 +215,11 @@ async def submit_solution(submission: SubmissionRequest):
         message = f"Not quite there yet!\n\n{feedback}\n\nKeep trying!"
         points = 0
     
-    return SubmissionResponse(
+    # Serialized by pydantic-core directly instead of FastAPI's jsonable_encoder walk
+    result = SubmissionResponse(
         success=success,
         message=message,
         points=points,
         feedback=feedback
     )
-
-@router.get("/random")
-async def get_random_challenge():
-    """Get a random challenge"""
-    challenge_id = random.choice(list(CHALLENGES.keys()))
-    return await get_challenge(challenge_id)
\ No newline at end of file
+    return Response(content=result.model_dump_json(), media_type="application/json")
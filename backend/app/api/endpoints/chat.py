@@ -1,23 +1,141 @@
 """
 FREE AI Chat - Template-based responses with Challenge Support
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 import re
-import json
+import orjson
+from cachetools import TTLCache
 
+from app.core.cache import get_redis, cache_get_json, cache_set_json, client_address, rate_limit
+from app.core.config import settings
 from app.utils.neuralfoil_wrapper import (
-    get_predictor,
     create_naca_airfoil,
     get_preset_coordinates,
     PRESETS
 )
+from app.services.prediction_batcher import prediction_batcher
 
 router = APIRouter()
 
-# In-memory challenge state (per session)
-active_challenges = {}
+# Precompiled extraction patterns
+_DIGIT_RE = re.compile(r'\d')
+_NACA_RE = re.compile(r'naca\s*(\d{4})')
+# All preset names in one scan; ties broken by PRESETS order like the old loop
+_PRESET_RE = re.compile('|'.join(re.escape(name) for name in PRESETS))
+_PRESET_ORDER = {name: i for i, name in enumerate(PRESETS)}
+# Alternatives are listed in priority order; named groups tell them apart
+_ALPHA_RE = re.compile(
+    r'(?:alpha|angle\s*of\s*attack|aoa)\s*[:]?\s*(?P<a1>-?\d+\.?\d*)'
+    r'|(?P<a2>\d+\.?\d*)\s*degrees?'
+    r'|at\s*(?P<a3>-?\d+\.?\d*)\s*°'
+)
+_REYNOLDS_RE = re.compile(
+    r'reynolds\s*(?:number)?\s*[:]?\s*(?P<r1>\d+\.?\d*)\s*(?:million|m)?'
+    r'|re\s*[=:]?\s*(?P<r2>\d+\.?\d*)\s*(?:million|m)?'
+)
+
+
+def _search_by_priority(pattern: re.Pattern, text: str) -> Optional[str]:
+    """Single scan returning the value captured by the highest-priority alternative"""
+    best_rank = None
+    best_value = None
+    for match in pattern.finditer(text):
+        rank = match.lastindex
+        if best_rank is None or rank < best_rank:
+            best_rank = rank
+            best_value = match.group(rank)
+            if rank == 1:
+                break
+    return best_value
+
+
+# Keyword sets, matched against a message's word tokens (so "trying" or
+# "this" don't count as "try" or "hi")
+_TRIGGER_WORDS = frozenset({'run', 'simulate', 'test', 'analyze', 'try', 'show'})
+_CHALLENGE_WORDS = frozenset({'challenge', 'challenges'})
+_EASY_WORDS = frozenset({'easy', 'beginner'})
+_MEDIUM_WORDS = frozenset({'medium', 'intermediate'})
+_HARD_WORDS = frozenset({'hard', 'difficult'})
+_GREETING_WORDS = frozenset({'hello', 'hi', 'hey'})
+_HELP_WORDS = frozenset({'help', 'how'})
+_WORD_RE = re.compile(r'[a-z]+')
+
+
+def _requested_challenge(tokens: set) -> Optional[str]:
+    """Key of the challenge a message asks to start, if any"""
+    if _CHALLENGE_WORDS.isdisjoint(tokens):
+        return None
+    if not _EASY_WORDS.isdisjoint(tokens):
+        return 'easy'
+    if not _MEDIUM_WORDS.isdisjoint(tokens):
+        return 'medium'
+    if not _HARD_WORDS.isdisjoint(tokens):
+        return 'hard'
+    return None
+
+# "What is X" concepts; lift outranks drag, which outranks L/D
+_LIFT_ANSWER = "**Lift Coefficient (CL)**: Measures how much lift an airfoil generates. Higher CL = more lift. Typical range: 0.2 to 1.5."
+_DRAG_ANSWER = "**Drag Coefficient (CD)**: Measures resistance. Lower CD = more efficient. Good airfoils have CD < 0.01."
+_LD_ANSWER = "**L/D Ratio**: Lift ÷ Drag. Higher is better! Good: L/D > 50. Excellent: L/D > 100."
+_CONCEPT_ANSWERS = {
+    'lift': _LIFT_ANSWER,
+    'cl': _LIFT_ANSWER,
+    'drag': _DRAG_ANSWER,
+    'cd': _DRAG_ANSWER,
+    'l/d': _LD_ANSWER,
+}
+_CONCEPT_PRIORITY = {'lift': 0, 'cl': 0, 'drag': 1, 'cd': 1, 'l/d': 2}
+_CONCEPT_RE = re.compile(r'\b(lift|cl|drag|cd|l/d)\b')
+
+# AI tutor for /stream, created on first use so the template chat doesn't
+# need the AI SDKs or keys
+_tutor = None
+
+
+def get_tutor():
+    global _tutor
+    if _tutor is None:
+        from app.services.ai_tutor_service import AITutorService
+        _tutor = AITutorService()
+    return _tutor
+
+
+# Active challenge key per session. Kept in Redis under challenge:{session_id}
+# when REDIS_URL is set; this bounded dict is the single-process fallback.
+active_challenges: Dict[str, str] = TTLCache(maxsize=settings.MAX_SESSIONS, ttl=settings.SESSION_TTL_SECONDS)
+
+
+def _challenge_key(session_id: str) -> str:
+    return f"challenge:{session_id}"
+
+
+async def get_active_challenge(session_id: str) -> Optional[Dict]:
+    redis = get_redis()
+    if redis is None:
+        challenge_id = active_challenges.get(session_id)
+    else:
+        data = await redis.get(_challenge_key(session_id))
+        challenge_id = data.decode() if data is not None else None
+    return CHALLENGES.get(challenge_id) if challenge_id else None
+
+
+async def set_active_challenge(session_id: str, challenge_id: str):
+    redis = get_redis()
+    if redis is None:
+        active_challenges[session_id] = challenge_id
+    else:
+        await redis.set(_challenge_key(session_id), challenge_id, ex=settings.SESSION_TTL_SECONDS)
+
+
+async def clear_active_challenge(session_id: str):
+    redis = get_redis()
+    if redis is None:
+        active_challenges.pop(session_id, None)
+    else:
+        await redis.delete(_challenge_key(session_id))
 
 # Challenge definitions
 CHALLENGES = {
@@ -69,6 +187,69 @@ CHALLENGES = {
     }
 }
 
+# Hint bullets never change, so render them once instead of per response
+for _challenge in CHALLENGES.values():
+    _challenge['hints_bulleted'] = '\n'.join('• ' + hint for hint in _challenge['hints'])
+del _challenge
+
+def _build_challenge_intros() -> Dict[str, str]:
+    """Render each challenge's intro message; they depend only on CHALLENGES"""
+    intros = {}
+
+    challenge = CHALLENGES['easy']
+    intros['easy'] = f"""🎯 **{challenge['title']}**
+
+{challenge['description']}
+
+**Requirements:**
+- Must test at {challenge['constraints']['alpha']}°
+- CL ≥ {challenge['constraints']['target_cl_min']}
+
+**Hints:**
+{challenge['hints_bulleted']}
+
+Try: "simulate NACA 2412 at 5 degrees"
+
+Challenge activated! Good luck! 🚀"""
+
+    challenge = CHALLENGES['medium']
+    intros['medium'] = f"""🎯 **{challenge['title']}**
+
+{challenge['description']}
+
+**Requirements:**
+- Must test at {challenge['constraints']['alpha']}°
+- CL > {challenge['constraints']['target_cl_min']}
+- CD < {challenge['constraints']['target_cd_max']}
+
+**Hints:**
+{challenge['hints_bulleted']}
+
+Try: "simulate NACA 4412 at 10 degrees"
+
+Challenge activated! Good luck! 🚀"""
+
+    challenge = CHALLENGES['hard']
+    intros['hard'] = f"""🎯 **{challenge['title']}**
+
+{challenge['description']}
+
+**Requirements:**
+- Test between {challenge['constraints']['alpha_min']}-{challenge['constraints']['alpha_max']}°
+- CL > {challenge['constraints']['target_cl_min']}
+- CD < {challenge['constraints']['target_cd_max']}
+- L/D > {challenge['constraints']['target_ld_min']}
+
+**Hints:**
+{challenge['hints_bulleted']}
+
+This is the toughest one! Good luck! 🚀"""
+
+    return intros
+
+
+CHALLENGE_INTROS = _build_challenge_intros()
+
 
 class ChatMessage(BaseModel):
     role: str
@@ -82,6 +263,18 @@ class ChatRequest(BaseModel):
     session_id: str = "default"  # Add session ID
 
 
+class ChatMessageRequest(BaseModel):
+    """
+    Request body for /message
+
+    The template chat never reads history or client-side results, so only the
+    fields it uses are declared; extra keys sent by older clients are ignored
+    instead of being validated item by item.
+    """
+    message: str
+    session_id: str = "default"
+
+
 class ChatResponse(BaseModel):
     response: str
     extracted_params: Optional[Dict] = None
@@ -91,49 +284,42 @@ class ChatResponse(BaseModel):
     challenge_passed: bool = False
 
 
-def extract_airfoil_params(text: str) -> Optional[Dict]:
-    """Extract airfoil parameters from natural language text"""
+def extract_airfoil_params(text_lower: str) -> Optional[Dict]:
+    """Extract airfoil parameters from natural language text (already lowercased)"""
     params = {}
-    text_lower = text.lower()
+
+    # NACA codes, angles and Reynolds numbers all need a digit, so purely
+    # conversational messages ("help", "hi") skip those scans entirely
+    has_digit = _DIGIT_RE.search(text_lower) is not None
 
     # NACA pattern
-    naca_match = re.search(r'naca\s*(\d{4})', text_lower)
-    if naca_match:
-        params['airfoil_type'] = 'naca'
-        params['naca_designation'] = naca_match.group(1)
+    if has_digit and 'naca' in text_lower:
+        naca_match = _NACA_RE.search(text_lower)
+        if naca_match:
+            params['airfoil_type'] = 'naca'
+            params['naca_designation'] = naca_match.group(1)
 
     # Preset pattern
-    for preset in PRESETS.keys():
-        if preset in text_lower:
-            params['airfoil_type'] = 'preset'
-            params['preset_name'] = preset
-            break
+    presets_found = _PRESET_RE.findall(text_lower)
+    if presets_found:
+        params['airfoil_type'] = 'preset'
+        params['preset_name'] = min(presets_found, key=_PRESET_ORDER.__getitem__)
+
+    if not has_digit:
+        return params if params else None
 
     # Angle of attack
-    alpha_patterns = [
-        r'(?:alpha|angle\s*of\s*attack|aoa)\s*[:]?\s*(-?\d+\.?\d*)',
-        r'(\d+\.?\d*)\s*degrees?',
-        r'at\s*(-?\d+\.?\d*)\s*°'
-    ]
-    for pattern in alpha_patterns:
-        alpha_match = re.search(pattern, text_lower)
-        if alpha_match:
-            params['alpha'] = float(alpha_match.group(1))
-            break
+    alpha_value = _search_by_priority(_ALPHA_RE, text_lower)
+    if alpha_value is not None:
+        params['alpha'] = float(alpha_value)
 
     # Reynolds number
-    reynolds_patterns = [
-        r'reynolds\s*(?:number)?\s*[:]?\s*(\d+\.?\d*)\s*(?:million|m)?',
-        r're\s*[=:]?\s*(\d+\.?\d*)\s*(?:million|m)?',
-    ]
-    for pattern in reynolds_patterns:
-        re_match = re.search(pattern, text_lower)
-        if re_match:
-            value = float(re_match.group(1))
-            if 'million' in text_lower or 'm' in text_lower:
-                value *= 1e6
-            params['reynolds'] = value
-            break
+    reynolds_value = _search_by_priority(_REYNOLDS_RE, text_lower)
+    if reynolds_value is not None:
+        value = float(reynolds_value)
+        if 'million' in text_lower or 'm' in text_lower:
+            value *= 1e6
+        params['reynolds'] = value
 
     return params if params else None
 
@@ -181,10 +367,9 @@ def check_challenge_requirements(challenge: Dict, simulation_results: Dict, alph
     return success, feedback
 
 
-def generate_response(message: str, params: Optional[Dict], simulation_results: Optional[Dict], 
+def generate_response(message_lower: str, tokens: frozenset, params: Optional[Dict], simulation_results: Optional[Dict], 
                      active_challenge: Optional[Dict], challenge_feedback: Optional[str]) -> str:
-    """Generate template-based response"""
-    message_lower = message.lower()
+    """Generate template-based response from the lowercased message and its word tokens"""
     
     # Challenge passed!
     if challenge_feedback and "✅" in challenge_feedback and active_challenge:
@@ -214,64 +399,15 @@ Want another challenge? Say "easy challenge", "medium challenge", or "hard chall
 {challenge_feedback}
 
 💡 **Hints:**
-{chr(10).join('• ' + hint for hint in active_challenge['hints'])}
+{active_challenge['hints_bulleted']}
 
 Keep trying! Adjust your airfoil or angle."""
     
     # Challenge requested
-    if 'challenge' in message_lower:
-        if 'easy' in message_lower or 'beginner' in message_lower:
-            challenge = CHALLENGES['easy']
-            return f"""🎯 **{challenge['title']}**
-
-{challenge['description']}
-
-**Requirements:**
-- Must test at {challenge['constraints']['alpha']}°
-- CL ≥ {challenge['constraints']['target_cl_min']}
-
-**Hints:**
-{chr(10).join('• ' + hint for hint in challenge['hints'])}
-
-Try: "simulate NACA 2412 at 5 degrees"
-
-Challenge activated! Good luck! 🚀"""
-        
-        elif 'medium' in message_lower or 'intermediate' in message_lower:
-            challenge = CHALLENGES['medium']
-            return f"""🎯 **{challenge['title']}**
-
-{challenge['description']}
-
-**Requirements:**
-- Must test at {challenge['constraints']['alpha']}°
-- CL > {challenge['constraints']['target_cl_min']}
-- CD < {challenge['constraints']['target_cd_max']}
-
-**Hints:**
-{chr(10).join('• ' + hint for hint in challenge['hints'])}
-
-Try: "simulate NACA 4412 at 10 degrees"
-
-Challenge activated! Good luck! 🚀"""
-        
-        elif 'hard' in message_lower or 'difficult' in message_lower:
-            challenge = CHALLENGES['hard']
-            return f"""🎯 **{challenge['title']}**
-
-{challenge['description']}
-
-**Requirements:**
-- Test between {challenge['constraints']['alpha_min']}-{challenge['constraints']['alpha_max']}°
-- CL > {challenge['constraints']['target_cl_min']}
-- CD < {challenge['constraints']['target_cd_max']}
-- L/D > {challenge['constraints']['target_ld_min']}
-
-**Hints:**
-{chr(10).join('• ' + hint for hint in challenge['hints'])}
-
-This is the toughest one! Good luck! 🚀"""
-        
+    if not _CHALLENGE_WORDS.isdisjoint(tokens):
+        requested = _requested_challenge(tokens)
+        if requested:
+            return CHALLENGE_INTROS[requested]
         else:
             return """🎯 **Available Challenges:**
 
@@ -287,11 +423,11 @@ This is the toughest one! Good luck! 🚀"""
 Say "easy challenge", "medium challenge", or "hard challenge"!"""
     
     # Greetings
-    if any(word in message_lower for word in ['hello', 'hi', 'hey']):
+    if not _GREETING_WORDS.isdisjoint(tokens):
         return "Hello! I'm your FREE CFD tutor. Try:\n• 'easy challenge' for a fun problem\n• 'simulate NACA 2412 at 8 degrees' to test airfoils"
     
     # Help
-    if any(word in message_lower for word in ['help', 'how', 'what can']):
+    if not _HELP_WORDS.isdisjoint(tokens) or 'what can' in message_lower:
         return """I can help you run CFD simulations!
 
 🎯 **Challenges:** Say "easy challenge" for guided problems
@@ -329,13 +465,10 @@ Let's get started!"""
 Want a challenge? Say "easy challenge"!"""
     
     # Concept explanations
-    if 'what is' in message_lower or 'explain' in message_lower:
-        if 'lift' in message_lower or 'cl' in message_lower:
-            return "**Lift Coefficient (CL)**: Measures how much lift an airfoil generates. Higher CL = more lift. Typical range: 0.2 to 1.5."
-        elif 'drag' in message_lower or 'cd' in message_lower:
-            return "**Drag Coefficient (CD)**: Measures resistance. Lower CD = more efficient. Good airfoils have CD < 0.01."
-        elif 'l/d' in message_lower:
-            return "**L/D Ratio**: Lift ÷ Drag. Higher is better! Good: L/D > 50. Excellent: L/D > 100."
+    if 'what is' in message_lower or 'explain' in tokens:
+        concepts = _CONCEPT_RE.findall(message_lower)
+        if concepts:
+            return _CONCEPT_ANSWERS[min(concepts, key=_CONCEPT_PRIORITY.__getitem__)]
     
     # Default
     if params:
@@ -347,30 +480,30 @@ Want a challenge? Say "easy challenge"!"""
 
 
 @router.post("/message", response_model=ChatResponse)
-async def send_chat_message(request: ChatRequest):
+async def send_chat_message(request: ChatMessageRequest, http_request: Request):
     """Send a message to the FREE chatbot"""
+    # Keyed on the caller's address: clients that omit session_id all share "default"
+    await rate_limit(client_address(http_request), "chat", settings.MAX_CHAT_MESSAGES_PER_MINUTE, 60)
     try:
         session_id = request.session_id
         
-        # Check if user is starting a challenge
+        # Lowercase and tokenize once; every keyword check below reuses these
         message_lower = request.message.lower()
-        if 'challenge' in message_lower:
-            if 'easy' in message_lower or 'beginner' in message_lower:
-                active_challenges[session_id] = CHALLENGES['easy']
-            elif 'medium' in message_lower or 'intermediate' in message_lower:
-                active_challenges[session_id] = CHALLENGES['medium']
-            elif 'hard' in message_lower or 'difficult' in message_lower:
-                active_challenges[session_id] = CHALLENGES['hard']
+        tokens = frozenset(_WORD_RE.findall(message_lower))
         
-        # Get active challenge
-        active_challenge = active_challenges.get(session_id)
+        # Check if user is starting a challenge
+        requested = _requested_challenge(tokens)
+        if requested:
+            await set_active_challenge(session_id, requested)
+            active_challenge = CHALLENGES[requested]
+        else:
+            active_challenge = await get_active_challenge(session_id)
         
         # Extract parameters
-        extracted_params = extract_airfoil_params(request.message)
+        extracted_params = extract_airfoil_params(message_lower)
         
         # Check if we should trigger simulation
-        trigger_words = ['run', 'simulate', 'test', 'analyze', 'try']
-        should_simulate = any(word in message_lower for word in trigger_words)
+        should_simulate = not _TRIGGER_WORDS.isdisjoint(tokens)
         
         simulation_results = None
         simulation_triggered = False
@@ -387,21 +520,29 @@ async def send_chat_message(request: ChatRequest):
                 
                 # Get coordinates
                 if extracted_params['airfoil_type'] == 'naca':
-                    coords = create_naca_airfoil(extracted_params['naca_designation'])
+                    airfoil_key = extracted_params['naca_designation']
+                    coords = create_naca_airfoil(airfoil_key)
                 elif extracted_params['airfoil_type'] == 'preset':
-                    coords = get_preset_coordinates(extracted_params['preset_name'])
+                    airfoil_key = extracted_params['preset_name']
+                    coords = get_preset_coordinates(airfoil_key)
                 else:
-                    coords = create_naca_airfoil("0012")
+                    airfoil_key = "0012"
+                    coords = create_naca_airfoil(airfoil_key)
                 
-                # Run simulation
-                predictor = get_predictor()
-                result = predictor.predict(
-                    coordinates=coords,
-                    alpha=extracted_params['alpha'],
-                    reynolds=extracted_params['reynolds']
-                )
+                # Predictions are deterministic, so repeat queries hit the cache
+                cache_key = f"pred:{airfoil_key}:{extracted_params['alpha']}:{extracted_params['reynolds']}"
+                result = await cache_get_json(cache_key)
+                if result is None:
+                    # Batched with concurrent /chat and /simulations/run predictions
+                    result = await prediction_batcher.predict(
+                        coords,
+                        alpha=extracted_params['alpha'],
+                        reynolds=extracted_params['reynolds']
+                    )
+                    await cache_set_json(cache_key, result)
                 
-                result['coordinates'] = coords.tolist()
+                # Kept as ndarray; orjson serializes it without a tolist() copy
+                result['coordinates'] = coords
                 simulation_results = result
                 simulation_triggered = True
                 
@@ -415,7 +556,7 @@ async def send_chat_message(request: ChatRequest):
                     
                     if challenge_passed:
                         # Clear challenge on success
-                        del active_challenges[session_id]
+                        await clear_active_challenge(session_id)
                 
             except Exception as sim_error:
                 return ChatResponse(
@@ -429,14 +570,16 @@ async def send_chat_message(request: ChatRequest):
         
         # Generate response
         ai_response = generate_response(
-            request.message, 
+            message_lower,
+            tokens,
             extracted_params, 
             simulation_results,
             active_challenge,
             challenge_feedback
         )
         
-        return ChatResponse(
+        # Every field is produced server-side, so skip re-validating them
+        response = ChatResponse.model_construct(
             response=ai_response,
             extracted_params=extracted_params,
             simulation_triggered=simulation_triggered,
@@ -444,21 +587,56 @@ async def send_chat_message(request: ChatRequest):
             challenge_active=active_challenge is not None,
             challenge_passed=challenge_passed
         )
+        # Returned as a response directly so the coordinates ndarray goes
+        # straight to orjson instead of through response_model serialization
+        return ORJSONResponse(response.model_dump())
         
     except Exception as e:
         raise HTTPException(500, f"Chat processing failed: {str(e)}")
 
 
+@router.post("/stream")
+async def stream_chat_message(request: ChatRequest, http_request: Request):
+    """
+    Stream an AI tutor reply as Server-Sent Events
+
+    Each event carries a JSON object {"delta": "<text>"}; the stream ends
+    with {"done": true}. /message remains the template-based endpoint.
+    """
+    # Every call here is a paid model request; shares the /message budget
+    await rate_limit(client_address(http_request), "chat", settings.MAX_CHAT_MESSAGES_PER_MINUTE, 60)
+    try:
+        tutor = get_tutor()
+    except Exception as e:
+        raise HTTPException(503, f"AI tutor unavailable: {str(e)}")
+
+    history = [m.model_dump() for m in request.conversation_history]
+
+    async def event_stream():
+        try:
+            async for text in tutor.stream_response(request.message, history):
+                yield b"data: " + orjson.dumps({"delta": text}) + b"\n\n"
+            yield b'data: {"done":true}\n\n'
+        except Exception as e:
+            yield b"data: " + orjson.dumps({"error": f"Chat processing failed: {str(e)}"}) + b"\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+# Static guidance payload, built once at import
+GUIDANCE = {
+    "message": "CFD LeetCode - FREE Platform",
+    "challenges": list(CHALLENGES.keys()),
+    "commands": [
+        "easy challenge",
+        "simulate NACA 2412 at 5 degrees",
+        "help",
+        "what is lift?"
+    ]
+}
+
+
 @router.get("/guidance")
 async def get_parameter_guidance():
     """Get parameter guidance"""
-    return {
-        "message": "CFD LeetCode - FREE Platform",
-        "challenges": ["easy", "medium", "hard"],
-        "commands": [
-            "easy challenge",
-            "simulate NACA 2412 at 5 degrees",
-            "help",
-            "what is lift?"
-        ]
-    }
\ No newline at end of file
+    return GUIDANCE
\ No newline at end of file
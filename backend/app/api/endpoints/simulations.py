@@ -1,9 +1,11 @@
 """
 Simulation API endpoints using NeuralFoil for real CFD predictions
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, PlainValidator, WithJsonSchema
+from typing import Annotated, Optional, List, Dict
 import numpy as np
 
 from app.utils.neuralfoil_wrapper import (
@@ -13,10 +15,38 @@ from app.utils.neuralfoil_wrapper import (
     get_preset_coordinates,
     PRESETS
 )
+from app.services.prediction_batcher import prediction_batcher
+from app.core.cache import client_address, rate_limit
+from app.core.config import settings
 
 router = APIRouter()
 
 
+def _to_coordinate_array(value) -> Optional[np.ndarray]:
+    """Convert raw JSON [[x, y], ...] straight into a float32 (N, 2) array"""
+    if value is None:
+        return None
+    if not isinstance(value, (list, tuple, np.ndarray)):
+        raise ValueError("coordinates must be a list of [x, y] number pairs")
+    if len(value) == 0:
+        return None
+    try:
+        coords = np.asarray(value, dtype=np.float32)
+    except (TypeError, ValueError):
+        raise ValueError("coordinates must be a list of [x, y] number pairs")
+    if coords.ndim != 2 or coords.shape[1] != 2:
+        raise ValueError("coordinates must be a list of [x, y] number pairs")
+    return coords
+
+
+# Skips Pydantic's per-float list validation; the JSON schema stays List[List[float]]
+CoordinateArray = Annotated[
+    np.ndarray,
+    PlainValidator(_to_coordinate_array),
+    WithJsonSchema({"type": "array", "items": {"type": "array", "items": {"type": "number"}}})
+]
+
+
 class SimulationRequest(BaseModel):
     """Request model for CFD simulation"""
     # Airfoil definition
@@ -25,7 +55,7 @@ class SimulationRequest(BaseModel):
     preset_name: Optional[str] = Field(None, description="Preset name from available presets")
     camber: Optional[float] = Field(None, ge=0, le=0.15, description="Custom camber (0-0.15)")
     thickness: Optional[float] = Field(None, ge=0.05, le=0.25, description="Custom thickness (0.05-0.25)")
-    coordinates: Optional[List[List[float]]] = Field(None, description="Custom (x,y) coordinates")
+    coordinates: Optional[CoordinateArray] = Field(None, description="Custom (x,y) coordinates")
 
     # Flow conditions
     alpha: float = Field(5.0, ge=-20, le=30, description="Angle of attack (degrees)")
@@ -95,8 +125,9 @@ def get_airfoil_coordinates(request) -> np.ndarray:
         return get_preset_coordinates(request.preset_name)
 
     elif request.airfoil_type == 'custom':
-        if hasattr(request, 'coordinates') and request.coordinates:
-            return np.array(request.coordinates, dtype=np.float32)
+        coordinates = getattr(request, 'coordinates', None)
+        if coordinates is not None:
+            return coordinates
         elif request.camber is not None and request.thickness is not None:
             return create_custom_airfoil(request.camber, request.thickness)
         else:
@@ -107,7 +138,7 @@ def get_airfoil_coordinates(request) -> np.ndarray:
 
 
 @router.post("/run", response_model=SimulationResponse)
-async def run_simulation(request: SimulationRequest):
+async def run_simulation(request: SimulationRequest, http_request: Request):
     """
     Run CFD simulation using NeuralFoil
 
@@ -121,25 +152,24 @@ async def run_simulation(request: SimulationRequest):
     }
     ```
     """
+    await rate_limit(client_address(http_request), "run", settings.MAX_SIMULATIONS_PER_HOUR, 3600)
     try:
         # Get airfoil coordinates
         coordinates = get_airfoil_coordinates(request)
 
-        # Get predictor instance
-        predictor = get_predictor()
-
-        # Run prediction
-        result = predictor.predict(
-            coordinates=coordinates,
+        # Run prediction; concurrent /run calls are batched into one
+        # vectorized NeuralFoil evaluation per airfoil (mach is unused)
+        result = await prediction_batcher.predict(
+            coordinates,
             alpha=request.alpha,
-            reynolds=request.reynolds,
-            mach=request.mach
+            reynolds=request.reynolds
         )
 
-        # Add coordinates to response
-        result['coordinates'] = coordinates.tolist()
+        # Add coordinates to response as the ndarray itself; returning the
+        # response directly lets orjson serialize it without tolist()
+        result['coordinates'] = coordinates
 
-        return SimulationResponse(**result)
+        return ORJSONResponse(result)
 
     except ValueError as e:
         raise HTTPException(400, str(e))
@@ -168,17 +198,18 @@ async def generate_polar(request: PolarRequest):
         coordinates = get_airfoil_coordinates(request)
         predictor = get_predictor()
 
-        results = predictor.predict_polar(
+        results = await run_in_threadpool(
+            predictor.predict_polar,
             coordinates=coordinates,
             alpha_range=(request.alpha_min, request.alpha_max),
             alpha_step=request.alpha_step,
             reynolds=request.reynolds
         )
 
-        return {
+        return ORJSONResponse({
             "polar_data": results,
-            "coordinates": coordinates.tolist()
-        }
+            "coordinates": coordinates
+        })
 
     except ValueError as e:
         raise HTTPException(400, str(e))
@@ -206,14 +237,16 @@ async def optimize_airfoil(request: OptimizationRequest):
         coordinates = get_airfoil_coordinates(request)
         predictor = get_predictor()
 
-        result = predictor.optimize_for_ld(
+        result = await run_in_threadpool(
+            predictor.optimize_for_ld,
             base_coordinates=coordinates,
             reynolds=request.reynolds,
             alpha=request.alpha,
             n_iterations=request.n_iterations
         )
 
-        return result
+        # Coordinates come back as an ndarray for orjson, not jsonable_encoder
+        return ORJSONResponse(result)
 
     except ValueError as e:
         raise HTTPException(400, str(e))
@@ -221,30 +254,31 @@ async def optimize_airfoil(request: OptimizationRequest):
         raise HTTPException(500, f"Optimization failed: {str(e)}")
 
 
+# Static preset listing, built once at import
+PRESET_LISTING = {
+    "presets": list(PRESETS.keys()),
+    "examples": {
+        "naca0012": "Symmetric, 12% thick",
+        "naca2412": "2% camber, 12% thick",
+        "naca4412": "4% camber, 12% thick",
+        "baseline": "Custom baseline design",
+        "high_lift": "High camber for max lift",
+        "low_drag": "Low thickness for efficiency"
+    }
+}
+
 @router.get("/presets")
 async def list_presets():
     """List available preset airfoils"""
-    return {
-        "presets": list(PRESETS.keys()),
-        "examples": {
-            "naca0012": "Symmetric, 12% thick",
-            "naca2412": "2% camber, 12% thick",
-            "naca4412": "4% camber, 12% thick",
-            "baseline": "Custom baseline design",
-            "high_lift": "High camber for max lift",
-            "low_drag": "Low thickness for efficiency"
-        }
-    }
+    return PRESET_LISTING
 
 
-@router.get("/health")
-async def health_check():
-    """Check if NeuralFoil is initialized and ready"""
+async def run_self_test() -> Dict:
+    """Run one NeuralFoil inference and build the health payload from it"""
     try:
         predictor = get_predictor()
-        # Run quick test
         test_coords = create_naca_airfoil("0012")
-        result = predictor.predict(test_coords, alpha=5.0, reynolds=1e6)
+        result = await run_in_threadpool(predictor.predict, test_coords, alpha=5.0, reynolds=1e6)
 
         return {
             "status": "healthy",
@@ -253,4 +287,21 @@ async def health_check():
             "test_latency_ms": result['time_ms']
         }
     except Exception as e:
-        raise HTTPException(500, f"Health check failed: {str(e)}")
+        return {"status": "unhealthy", "solver": "NeuralFoil", "error": str(e)}
+
+
+@router.get("/health")
+async def health_check(request: Request):
+    """
+    Check if NeuralFoil is initialized and ready
+
+    Returns the self-test recorded at startup; the inference is only
+    re-run while the solver is unhealthy.
+    """
+    health = getattr(request.app.state, "neuralfoil_health", None)
+    if health is None or health["status"] != "healthy":
+        health = request.app.state.neuralfoil_health = await run_self_test()
+
+    if health["status"] != "healthy":
+        raise HTTPException(500, f"Health check failed: {health['error']}")
+    return health
@@ -0,0 +1,111 @@
+"""
+Shared Redis connection for state that must survive restarts and be
+visible to every Uvicorn worker, plus a small JSON result cache and
+fixed-window rate limiter on top of it
+"""
+
+from typing import Any, Dict, Optional
+
+import orjson
+from cachetools import TTLCache
+from fastapi import HTTPException, Request
+from redis import asyncio as aioredis
+
+from .config import settings
+
+
+_redis: Optional[aioredis.Redis] = None
+
+# Used by the result cache when REDIS_URL is not configured
+_local_cache = TTLCache(maxsize=4096, ttl=settings.RESULT_CACHE_TTL_SECONDS)
+
+# Used by rate_limit when REDIS_URL is not configured, one counter cache per window length
+_local_counters: Dict[int, TTLCache] = {}
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """
+    Get the process-wide async Redis client
+
+    Returns:
+        Redis client, or None when REDIS_URL is not configured
+    """
+    global _redis
+    if _redis is None and settings.REDIS_URL:
+        _redis = aioredis.Redis.from_url(settings.REDIS_URL)
+    return _redis
+
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None on a miss"""
+    redis = get_redis()
+    data = await redis.get(key) if redis is not None else _local_cache.get(key)
+    return orjson.loads(data) if data is not None else None
+
+
+async def cache_set_json(key: str, value: Any):
+    """Cache a JSON-serializable value for RESULT_CACHE_TTL_SECONDS"""
+    data = orjson.dumps(value)
+    redis = get_redis()
+    if redis is not None:
+        await redis.set(key, data, ex=settings.RESULT_CACHE_TTL_SECONDS)
+    else:
+        _local_cache[key] = data
+
+
+def client_address(request: Request) -> str:
+    """
+    Address of the calling client, for per-client limits
+
+    With TRUSTED_PROXY_HOPS = n, the n-th X-Forwarded-For entry from the
+    right is used: our own outermost proxy wrote it, while everything to its
+    left comes from the client and can be forged. Otherwise (the default)
+    this is the socket peer address.
+    """
+    hops = settings.TRUSTED_PROXY_HOPS
+    if hops > 0:
+        entries = ",".join(request.headers.getlist("x-forwarded-for")).split(",")
+        if len(entries) >= hops and entries[-hops].strip():
+            return entries[-hops].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def rate_limit(client_id: str, bucket: str, limit: int, window: int):
+    """
+    Count a request against a fixed-window limit
+
+    Args:
+        client_id: Client address the limit applies to (see client_address)
+        bucket: Name of the limited action (e.g. "chat", "run")
+        limit: Requests allowed per window; 0 disables the check
+        window: Window length in seconds
+
+    Raises:
+        HTTPException: 429 once the window's limit is exceeded
+    """
+    if limit <= 0:
+        return
+
+    key = f"rl:{bucket}:{client_id}"
+    redis = get_redis()
+    if redis is not None:
+        # One MULTI: the first request of a window creates the key with its
+        # TTL (INCR keeps it), so a crash can never leave a counter that
+        # never expires; every worker sees the same count
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, 0, ex=window, nx=True)
+            pipe.incr(key)
+            _, count = await pipe.execute()
+    else:
+        counters = _local_counters.get(window)
+        if counters is None:
+            counters = _local_counters[window] = TTLCache(maxsize=settings.MAX_SESSIONS * 4, ttl=window)
+        # Mutate in place; re-assigning the key would restart its TTL
+        counter = counters.get(key)
+        if counter is None:
+            counter = counters[key] = [0]
+        counter[0] += 1
+        count = counter[0]
+
+    if count > limit:
+        raise HTTPException(429, f"Rate limit exceeded: {limit} requests per {window}s")
@@ -1,5 +1,6 @@
-from typing import List
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import List, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 
 class Settings(BaseSettings):
@@ -12,6 +13,8 @@ class Settings(BaseSettings):
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    # Keep at 1 unless REDIS_URL is set; sessions otherwise live in one process
+    WORKERS: int = 1
     
     # CORS
     CORS_ORIGINS: List[str] = [
@@ -22,7 +25,46 @@ class Settings(BaseSettings):
         "https://airfoillearner.netlify.app",
     ]
     
-    # ... rest of your config stays the same
+    # AI tutor (optional; the template chat works without any keys)
+    AI_PROVIDER: str = "anthropic"
+    AI_MODEL: str = "claude-3-5-sonnet-20241022"
+    # Smaller model for simple rewording tasks (predefined hints); unset picks
+    # the provider's small model
+    AI_FAST_MODEL: Optional[str] = None
+    ANTHROPIC_API_KEY: Optional[str] = None
+    OPENAI_API_KEY: Optional[str] = None
+    AI_TIMEOUT_SECONDS: float = 60.0
+    AI_MAX_RETRIES: int = 2
+    
+    # Redis (shared state across workers; leave unset for in-process state)
+    # A unix socket URL (unix:///path/to/redis.sock) avoids TCP overhead
+    REDIS_URL: Optional[str] = None
+    SESSION_TTL_SECONDS: int = 3600
+    MAX_SESSIONS: int = 1024
+    RESULT_CACHE_TTL_SECONDS: int = 86400
+    
+    # Rate limiting (chat and simulations per client address)
+    # Proxies in front of the app that append to X-Forwarded-For; the client
+    # address is read that many entries from the right. Leave at 0 (use the
+    # socket peer) unless every request really passes through them, or the
+    # header is client-controlled
+    TRUSTED_PROXY_HOPS: int = 0
+    MAX_SIMULATIONS_PER_HOUR: int = 20
+    MAX_CHAT_MESSAGES_PER_MINUTE: int = 10
+    
+    # Database (SQLite by default; set postgresql+asyncpg URLs in production)
+    DATABASE_URL: str = "sqlite+aiosqlite:///./airfoil.db"
+    DATABASE_URL_SYNC: str = "sqlite:///./airfoil.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: int = 3
+    
+    # JWT Authentication
+    SECRET_KEY: str = "change-me-in-production"
+    ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
@@ -31,9 +73,16 @@ class Settings(BaseSettings):
             return [i.strip() for i in v.split(",")]
         return v
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-        extra = "ignore"
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore",
+        frozen=True
+    )
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build settings once per process (env parsing and validators run once)"""
+    return Settings()
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
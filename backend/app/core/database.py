@@ -2,7 +2,11 @@
 Database configuration and session management
 """
 
-from sqlalchemy import create_engine
+import asyncio
+import uuid
+
+from sqlalchemy import JSON, Column, create_engine, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -10,11 +14,37 @@ from sqlalchemy.orm import sessionmaker
 from .config import settings
 
 
+def _engine_options(url: str) -> dict:
+    """
+    Connection pool options for a database URL
+
+    SQLite gets SQLAlchemy's defaults; server databases get a sized pool that
+    pings connections on checkout and recycles them before idle timeouts.
+    """
+    if url.startswith("sqlite"):
+        return {}
+
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+    if "+asyncpg" in url:
+        options["connect_args"] = {
+            "server_settings": {"application_name": settings.APP_NAME.lower()},
+            "timeout": 10,
+        }
+    return options
+
+
 # Async engine for FastAPI
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    future=True
+    future=True,
+    **_engine_options(settings.DATABASE_URL)
 )
 
 # Sync engine for migrations and scripts
@@ -33,6 +63,24 @@ async_session_maker = sessionmaker(
 # Base class for models
 Base = declarative_base()
 
+# JSON column type: binary, indexable JSONB on PostgreSQL, plain JSON elsewhere (SQLite)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+_IS_POSTGRES = settings.DATABASE_URL.startswith("postgresql")
+
+
+def uuid_pk() -> Column:
+    """
+    UUID primary key column
+
+    PostgreSQL generates ids itself (gen_random_uuid()) and returns them via
+    RETURNING; other databases fall back to Python-side uuid4. Ids are kept
+    as strings rather than wrapped in uuid.UUID objects on every fetch.
+    """
+    if _IS_POSTGRES:
+        return Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
+    return Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+
 
 async def get_db() -> AsyncSession:
     """
@@ -57,9 +105,32 @@ async def get_db() -> AsyncSession:
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
+        if _IS_POSTGRES:
+            # gen_random_uuid() is built in from PostgreSQL 13; older servers need pgcrypto
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pgcrypto"))
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def ping_db(timeout: float = 2.0) -> bool:
+    """
+    Check database connectivity for health probes
+
+    Uses a short-lived connection rather than a request session, so the
+    probe never leaves a transaction open (or "idle in transaction" behind
+    PgBouncer) and can't hold a pool slot past the timeout.
+    """
+    async def _ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.rollback()
+
+    try:
+        await asyncio.wait_for(_ping(), timeout)
+        return True
+    except Exception:
+        return False
+
+
 async def close_db():
     """Close database connections"""
     await engine.dispose()
@@ -1,12 +1,41 @@
-from fastapi import FastAPI
+import logging
+import orjson
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.core.config import settings
-from app.api.endpoints import agent, simulations, chat
+from app.api.endpoints import agent, simulations, chat, challenges, batch
+from app.services.prediction_batcher import prediction_batcher
+
+logger = logging.getLogger(__name__)
+
+# Constant body for unhandled errors; details go to the log, not the client
+_INTERNAL_ERROR_BODY = b'{"detail":"Internal server error"}'
+
+class SSEAwareGZipMiddleware(GZipMiddleware):
+    """GZip that leaves Server-Sent Event streams alone so events aren't held in the compressor"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Run the NeuralFoil self-test once (also warms the model) so health probes stay cheap
+    app.state.neuralfoil_health = await simulations.run_self_test()
+    yield
+    await prediction_batcher.close()
 
 app = FastAPI(
     title=settings.APP_NAME, 
     description="AirfoilLearner - AI Agent + Ultra-fast CFD",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -14,55 +43,67 @@ app.add_middleware(
     allow_origins=settings.CORS_ORIGINS, 
     allow_credentials=True, 
     allow_methods=["*"], 
-    allow_headers=["*"]
+    allow_headers=["*"],
+    # Let browsers reuse a preflight for a day instead of Starlette's 10 minutes
+    max_age=86400
 )
 
+# Coordinates and polar arrays compress several-fold; small bodies aren't worth it
+app.add_middleware(SSEAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    # HTTPException and validation errors keep FastAPI's own handlers
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path)
+    return Response(content=_INTERNAL_ERROR_BODY, status_code=500, media_type="application/json")
+
 # Include all routers
 app.include_router(agent.router, prefix=f"{settings.API_V1_PREFIX}/agent", tags=["Agent"])
 app.include_router(simulations.router, prefix=f"{settings.API_V1_PREFIX}/simulations", tags=["Simulations"])
 app.include_router(chat.router, prefix=f"{settings.API_V1_PREFIX}/chat", tags=["Chat"])
+app.include_router(challenges.router, prefix=f"{settings.API_V1_PREFIX}/challenges", tags=["Challenges"])
+app.include_router(batch.router, prefix=f"{settings.API_V1_PREFIX}/batch", tags=["Batch"])
 
-@app.get("/")
-async def root():
-    return {
-        "app": settings.APP_NAME, 
-        "status": "running", 
-        "docs": "/docs",
-        "endpoints": {
-            "agent": "/api/v1/agent",
-            "simulations": "/api/v1/simulations",
-            "chat": "/api/v1/chat"
-        }
+# / and /health never change at runtime, so their bodies are serialized once
+_ROOT_BODY = orjson.dumps({
+    "app": settings.APP_NAME, 
+    "status": "running", 
+    "docs": "/docs",
+    "endpoints": {
+        "agent": "/api/v1/agent",
+        "simulations": "/api/v1/simulations",
+        "chat": "/api/v1/chat",
+        "challenges": "/api/v1/challenges",
+        "batch": "/api/v1/batch"
     }
+})
 
-@app.get("/health")
-async def health():
-    return {
-        "status": "healthy", 
-        "agent": "FREE", 
-        "cfd": "NeuralFoil",
-        "features": ["agent", "simulations", "chat"]
-    }
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy", 
+    "agent": "FREE", 
+    "cfd": "NeuralFoil",
+    "features": ["agent", "simulations", "chat", "challenges"]
+})
 
 @app.get("/")
 async def root():
-    return {
-        "app": settings.APP_NAME, 
-        "status": "running", 
-        "docs": "/docs",
-        "endpoints": {
-            "agent": "/api/v1/agent",
-            "simulations": "/api/v1/simulations",
-            "chat": "/api/v1/chat",
-            "challenges": "/api/v1/challenges"  # ← Add this
-        }
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 @app.get("/health")
 async def health():
-    return {
-        "status": "healthy", 
-        "agent": "FREE", 
-        "cfd": "NeuralFoil",
-        "features": ["agent", "simulations", "chat", "challenges"]  # ← Add this
-    }
\ No newline at end of file
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop/httptools ship with uvicorn[standard]; reload implies a single worker
+    uvicorn.run(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if settings.DEBUG else settings.WORKERS,
+        reload=settings.DEBUG,
+        log_level="info" if settings.DEBUG else "warning"
+    )
@@ -2,14 +2,13 @@
 Challenge database models
 """
 
-import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Enum as SQLEnum, JSON, Boolean, Text
+from sqlalchemy import Column, Index, String, DateTime, Integer, ForeignKey, Enum as SQLEnum, Boolean, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, JSONType, uuid_pk
 
 
 class DifficultyLevel(str, enum.Enum):
@@ -31,7 +30,7 @@ class ChallengeCategory(str, enum.Enum):
 class Challenge(Base):
     __tablename__ = "challenges"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = uuid_pk()
 
     # Basic info
     title = Column(String(200), nullable=False)
@@ -41,7 +40,7 @@ class Challenge(Base):
     category = Column(SQLEnum(ChallengeCategory), nullable=False)
 
     # Challenge configuration
-    constraints = Column(JSON, nullable=False)
+    constraints = Column(JSONType, nullable=False)
     # Example: {
     #   "airfoil_type": "naca_4digit",
     #   "airfoil_options": ["0012", "2412", "4412"],
@@ -50,7 +49,7 @@ class Challenge(Base):
     #   "max_simulations": 10
     # }
 
-    validation_criteria = Column(JSON, nullable=False)
+    validation_criteria = Column(JSONType, nullable=False)
     # Example: {
     #   "target_cl_max": 1.45,
     #   "tolerance": 0.05,
@@ -59,15 +58,15 @@ class Challenge(Base):
     # }
 
     # Educational content
-    hints = Column(JSON)  # List of progressive hints
+    hints = Column(JSONType)  # List of progressive hints
     # Example: [
     #   "Start by visualizing the Cp distribution",
     #   "Look for flow separation indicators",
     #   "Try increasing the angle of attack gradually"
     # ]
 
-    learning_objectives = Column(JSON)  # List of learning objectives
-    reference_solution = Column(JSON)  # Reference solution data (hidden from users)
+    learning_objectives = Column(JSONType)  # List of learning objectives
+    reference_solution = Column(JSONType)  # Reference solution data (hidden from users)
 
     # Metadata
     points = Column(Integer, default=100)  # Points awarded for completion
@@ -80,6 +79,11 @@ class Challenge(Base):
     simulations = relationship("Simulation", back_populates="challenge")
     submissions = relationship("ChallengeSubmission", back_populates="challenge")
 
+    __table_args__ = (
+        # Lets constraint filters (@>, ?) use an index on PostgreSQL
+        Index("ix_challenge_constraints_gin", "constraints", postgresql_using="gin"),
+    )
+
     def __repr__(self):
         return f"<Challenge(title='{self.title}', difficulty='{self.difficulty}')>"
 
@@ -87,14 +91,14 @@ class Challenge(Base):
 class ChallengeSubmission(Base):
     __tablename__ = "challenge_submissions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    challenge_id = Column(UUID(as_uuid=True), ForeignKey("challenges.id"), nullable=False)
-    simulation_id = Column(UUID(as_uuid=True), ForeignKey("simulations.id"), nullable=False)
+    id = uuid_pk()
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    challenge_id = Column(UUID(as_uuid=False), ForeignKey("challenges.id"), nullable=False, index=True)
+    simulation_id = Column(UUID(as_uuid=False), ForeignKey("simulations.id"), nullable=False)
 
     # Validation results
     is_correct = Column(Boolean, nullable=False)
-    validation_results = Column(JSON)  # Detailed validation breakdown
+    validation_results = Column(JSONType)  # Detailed validation breakdown
     # Example: {
     #   "cl_max_achieved": 1.47,
     #   "cl_max_target": 1.45,
@@ -112,8 +116,13 @@ class ChallengeSubmission(Base):
 
     # Relationships
     user = relationship("User", back_populates="challenge_submissions")
-    challenge = relationship("Challenge", back_populates="submissions")
+    challenge = relationship("Challenge", back_populates="submissions", lazy="selectin")
     simulation = relationship("Simulation")
 
+    __table_args__ = (
+        # A user's submissions for a challenge; also covers user_id lookups
+        Index("ix_sub_user_challenge", "user_id", "challenge_id"),
+    )
+
     def __repr__(self):
         return f"<ChallengeSubmission(user_id='{self.user_id}', challenge_id='{self.challenge_id}', correct={self.is_correct})>"
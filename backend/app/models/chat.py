@@ -2,14 +2,13 @@
 Chat message database model for AI tutor interactions
 """
 
-import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, Text
+from sqlalchemy import Column, Index, String, DateTime, ForeignKey, Enum as SQLEnum, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, uuid_pk
 
 
 class MessageRole(str, enum.Enum):
@@ -21,9 +20,9 @@ class MessageRole(str, enum.Enum):
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    simulation_id = Column(UUID(as_uuid=True), ForeignKey("simulations.id"), nullable=True)
+    id = uuid_pk()
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    simulation_id = Column(UUID(as_uuid=False), ForeignKey("simulations.id"), nullable=True, index=True)
 
     # Message content
     role = Column(SQLEnum(MessageRole), nullable=False)
@@ -38,6 +37,11 @@ class ChatMessage(Base):
     # Relationships
     user = relationship("User", back_populates="chat_messages")
 
+    __table_args__ = (
+        # Chat history for a user (and simulation), newest first; also covers user_id lookups
+        Index("ix_chat_user_sim_ts", user_id, simulation_id, timestamp.desc()),
+    )
+
     def __repr__(self):
         return f"<ChatMessage(role='{self.role}', timestamp='{self.timestamp}')>"
 
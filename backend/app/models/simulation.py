@@ -2,14 +2,13 @@
 Simulation database model
 """
 
-import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Float, Integer, ForeignKey, Enum as SQLEnum, JSON
+from sqlalchemy import event, Column, String, DateTime, Float, Integer, ForeignKey, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, JSONType, uuid_pk
 
 
 class SimulationStatus(str, enum.Enum):
@@ -29,14 +28,14 @@ class SolverType(str, enum.Enum):
 class Simulation(Base):
     __tablename__ = "simulations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    challenge_id = Column(UUID(as_uuid=True), ForeignKey("challenges.id"), nullable=True)
+    id = uuid_pk()
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False, index=True)
+    challenge_id = Column(UUID(as_uuid=False), ForeignKey("challenges.id"), nullable=True, index=True)
 
     # Simulation configuration
     airfoil_type = Column(String(50), nullable=False)  # "naca_4digit", "naca_5digit", "custom"
     airfoil_designation = Column(String(50))  # e.g., "0012", "2412"
-    airfoil_coords = Column(JSON)  # Store airfoil coordinates if custom
+    airfoil_coords = Column(JSONType)  # Store airfoil coordinates if custom
 
     # Flow parameters
     alpha = Column(Float, nullable=False)  # Angle of attack (degrees)
@@ -46,32 +45,36 @@ class Simulation(Base):
 
     # Solver configuration
     solver_type = Column(SQLEnum(SolverType), default=SolverType.XFOIL)
-    viscous = Column(JSON, default=True)  # Enable viscous analysis
+    viscous = Column(JSONType, default=True)  # Enable viscous analysis
     max_iterations = Column(Integer, default=100)
 
     # Status
-    status = Column(SQLEnum(SimulationStatus), default=SimulationStatus.QUEUED)
+    status = Column(SQLEnum(SimulationStatus), default=SimulationStatus.QUEUED, index=True)
     progress = Column(Integer, default=0)  # Progress percentage (0-100)
     error_message = Column(String(500))
 
     # Results (stored as JSON)
-    results = Column(JSON)  # {cl, cd, cdp, cm, top_xtr, bot_xtr, converged, cp_distribution, ...}
+    results = Column(JSONType)  # {cl, cd, cdp, cm, top_xtr, bot_xtr, converged, cp_distribution, ...}
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     started_at = Column(DateTime)
     completed_at = Column(DateTime)
+    # Stored at completion so reads and "slowest runs" queries need no arithmetic
+    runtime_seconds = Column(Float, index=True)
 
     # Relationships
     user = relationship("User", back_populates="simulations")
-    challenge = relationship("Challenge", back_populates="simulations")
+    # Lists show the challenge title; load it for all rows in one extra SELECT instead of one per row
+    challenge = relationship("Challenge", back_populates="simulations", lazy="selectin")
 
     def __repr__(self):
         return f"<Simulation(id='{self.id}', airfoil='{self.airfoil_designation}', alpha={self.alpha})>"
 
-    @property
-    def runtime_seconds(self) -> float:
-        """Calculate simulation runtime in seconds"""
-        if self.started_at and self.completed_at:
-            return (self.completed_at - self.started_at).total_seconds()
-        return 0.0
+
+@event.listens_for(Simulation, "before_insert")
+@event.listens_for(Simulation, "before_update")
+def _store_runtime_seconds(mapper, connection, target):
+    """Fill runtime_seconds whenever a row is written with both timestamps set"""
+    if target.started_at and target.completed_at:
+        target.runtime_seconds = (target.completed_at - target.started_at).total_seconds()
@@ -2,14 +2,12 @@
 User database model
 """
 
-import uuid
 from datetime import datetime
 from sqlalchemy import Column, String, DateTime, Boolean, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, uuid_pk
 
 
 class SkillLevel(str, enum.Enum):
@@ -21,7 +19,7 @@ class SkillLevel(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = uuid_pk()
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
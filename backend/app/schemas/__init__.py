@@ -0,0 +1,9 @@
+"""
+Pydantic schemas package (API request/response shapes)
+"""
+
+from .simulation import SimulationRead
+
+__all__ = [
+    "SimulationRead",
+]
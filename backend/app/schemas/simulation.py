@@ -0,0 +1,37 @@
+"""
+Simulation response schemas
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
+
+from app.models.simulation import SimulationStatus, SolverType
+
+
+class SimulationRead(BaseModel):
+    """Simulation row as returned by the API; built straight from the ORM object"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+    challenge_id: Optional[str] = None
+
+    airfoil_type: str
+    airfoil_designation: Optional[str] = None
+    airfoil_coords: Optional[List[List[float]]] = None
+
+    alpha: float
+    reynolds: float
+    mach: Optional[float] = None
+    solver_type: Optional[SolverType] = None
+
+    status: Optional[SimulationStatus] = None
+    progress: Optional[int] = None
+    error_message: Optional[str] = None
+    results: Optional[Dict[str, Any]] = None
+
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    runtime_seconds: Optional[float] = None  # Stored on the row once the run completes
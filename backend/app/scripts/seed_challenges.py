@@ -3,9 +3,13 @@ Seed database with challenge definitions from JSON files
 """
 
 import asyncio
-import json
 import sys
 from pathlib import Path
+
+import orjson
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Add parent directory to path
@@ -15,9 +19,15 @@ from app.core.database import async_session_maker
 from app.models import Challenge, DifficultyLevel, ChallengeCategory
 
 
+async def _load_challenge(json_file: Path) -> dict:
+    """Read and parse one challenge file off the event loop"""
+    print(f"Loading {json_file.name}...")
+    return orjson.loads(await asyncio.to_thread(json_file.read_bytes))
+
+
 async def load_challenges_from_json(challenges_dir: Path) -> list:
     """Load challenge definitions from JSON files"""
-    challenges = []
+    json_files = []
 
     # Iterate through difficulty directories
     for difficulty_dir in ["easy", "medium", "hard"]:
@@ -25,40 +35,47 @@ async def load_challenges_from_json(challenges_dir: Path) -> list:
         if not dir_path.exists():
             print(f"⚠️  Directory not found: {dir_path}")
             continue
+        json_files.extend(dir_path.glob("*.json"))
 
-        # Load each JSON file
-        for json_file in dir_path.glob("*.json"):
-            print(f"Loading {json_file.name}...")
-            with open(json_file, 'r') as f:
-                challenge_data = json.load(f)
-                challenges.append(challenge_data)
-
-    return challenges
+    # Read every file concurrently; gather keeps the directory order
+    return list(await asyncio.gather(*(_load_challenge(f) for f in json_files)))
 
 
 async def seed_challenges(session: AsyncSession, challenges: list):
-    """Insert challenges into database"""
-    for challenge_data in challenges:
-        # Create Challenge object
-        challenge = Challenge(
-            title=challenge_data["title"],
-            slug=challenge_data["slug"],
-            description=challenge_data["description"],
-            difficulty=DifficultyLevel(challenge_data["difficulty"]),
-            category=ChallengeCategory(challenge_data["category"]),
-            constraints=challenge_data["constraints"],
-            validation_criteria=challenge_data["validation_criteria"],
-            hints=challenge_data.get("hints", []),
-            learning_objectives=challenge_data.get("learning_objectives", []),
-            reference_solution=challenge_data.get("reference_solution"),
-            points=challenge_data.get("points", 100),
-            order=challenge_data.get("order", 0),
-            is_active=True
-        )
-
-        session.add(challenge)
-        print(f"  ✅ Added: {challenge.title}")
-
+    """Insert or update challenges (matched by slug) with a single bulk upsert"""
+    rows = [
+        {
+            "title": challenge_data["title"],
+            "slug": challenge_data["slug"],
+            "description": challenge_data["description"],
+            "difficulty": DifficultyLevel(challenge_data["difficulty"]),
+            "category": ChallengeCategory(challenge_data["category"]),
+            "constraints": challenge_data["constraints"],
+            "validation_criteria": challenge_data["validation_criteria"],
+            "hints": challenge_data.get("hints", []),
+            "learning_objectives": challenge_data.get("learning_objectives", []),
+            "reference_solution": challenge_data.get("reference_solution"),
+            "points": challenge_data.get("points", 100),
+            "order": challenge_data.get("order", 0),
+            "is_active": True
+        }
+        for challenge_data in challenges
+    ]
+    if not rows:
+        return
+
+    # One multi-row upsert keyed on slug: a single round trip, and re-running the seed
+    # refreshes existing challenges instead of failing on the unique constraint
+    insert = pg_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(Challenge).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Challenge.slug],
+        set_={
+            **{column: stmt.excluded[column] for column in rows[0] if column != "slug"},
+            "updated_at": func.now()
+        }
+    )
+    await session.execute(stmt)
     await session.commit()
 
 
@@ -8,36 +8,147 @@ This service provides context-aware AI assistance for learning CFD:
 - Provides hints for challenges
 """
 
-import json
-from typing import List, Dict, Optional
-from anthropic import Anthropic
-from openai import OpenAI
-
+import asyncio
+import hashlib
+import httpx
+import orjson
+from typing import AsyncIterator, ClassVar, List, Dict, Optional
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
+
+from app.core.cache import cache_get_json, cache_set_json
 from app.core.config import settings
-from app.models import Simulation, Challenge
 
 
-class AITutorService:
-    """AI-powered CFD tutor using Claude or GPT-4"""
+# SDK clients are shared across tutor instances so their HTTP connection
+# pools (and TLS sessions) are reused between requests
+_http_client: Optional[httpx.AsyncClient] = None
+_anthropic_client: Optional[AsyncAnthropic] = None
+_openai_client: Optional[AsyncOpenAI] = None
 
-    def __init__(self):
-        self.provider = settings.AI_PROVIDER
 
-        if self.provider == "anthropic":
-            self.client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-            self.model = settings.AI_MODEL
-        elif self.provider == "openai":
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            self.model = settings.AI_MODEL
-        else:
-            raise ValueError(f"Unsupported AI provider: {self.provider}")
+def get_http_client() -> httpx.AsyncClient:
+    """Return the one connection pool both provider SDKs send through"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=settings.AI_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _http_client
+
+
+def get_anthropic_client() -> AsyncAnthropic:
+    """Return the process-wide async Anthropic client, creating it on first use"""
+    global _anthropic_client
+    if _anthropic_client is None:
+        _anthropic_client = AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            max_retries=settings.AI_MAX_RETRIES,
+            timeout=settings.AI_TIMEOUT_SECONDS,
+            http_client=get_http_client()
+        )
+    return _anthropic_client
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the process-wide async OpenAI client, creating it on first use"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=settings.AI_MAX_RETRIES,
+            timeout=settings.AI_TIMEOUT_SECONDS,
+            http_client=get_http_client()
+        )
+    return _openai_client
+
+
+# In-flight tutor calls keyed by their message list, so concurrent identical
+# requests (e.g. many users asking "explain lift") coalesce into one call
+_inflight: Dict[bytes, asyncio.Future] = {}
+
+# Decode time grows with output length, so each task gets a budget sized to
+# what its answer actually needs (chat turns use the default)
+DEFAULT_MAX_TOKENS = 1024
+
+# Used for cheap tasks when AI_FAST_MODEL is not configured
+_DEFAULT_FAST_MODELS = {
+    "anthropic": "claude-3-5-haiku-20241022",
+    "openai": "gpt-4o-mini",
+}
+
+# Prompt/context templates, parsed once and filled with str.format so every
+# caller renders the same fields into byte-identical text
+_SIM_CTX_TMPL = (
+    "Current simulation: {design} airfoil\n"
+    "- Angle of attack: {alpha}°\n"
+    "- Reynolds number: {re:.2e}\n"
+    "- Solver: {solver}\n"
+    "- Status: {status}"
+)
+
+_SIM_RESULTS_CTX_TMPL = (
+    "\nResults:\n"
+    "- CL: {cl}\n"
+    "- CD: {cd}\n"
+    "- CM: {cm}\n"
+    "- Converged: {converged}"
+)
+
+_CHALLENGE_CTX_TMPL = (
+    "\nActive challenge: '{title}'\n"
+    "- Difficulty: {difficulty}\n"
+    "- Category: {category}"
+)
+
+_DEBUG_PROMPT_TMPL = """I'm having trouble with my CFD simulation. Here are the details:
+
+Airfoil: {design}
+Angle of attack: {alpha}°
+Reynolds number: {re:.2e}
+Mach number: {mach}
+Solver: {solver}
+Status: {status}
+"""
+
+_DEBUG_RESULTS_TMPL = """
+Results:
+- CL: {cl}
+- CD: {cd}
+- Converged: {converged}
+"""
 
-        # System prompt for CFD tutoring
-        self.system_prompt = self._build_system_prompt()
+_ANALYZE_PROMPT_TMPL = """Analyze these CFD simulation results for {design} airfoil:
 
-    def _build_system_prompt(self) -> str:
-        """Build comprehensive system prompt for CFD tutoring"""
-        return """You are an expert CFD (Computational Fluid Dynamics) tutor for AirfoilLearner,
+Parameters:
+- Angle of attack: {alpha}°
+- Reynolds number: {re:.2e}
+
+Results:
+- CL (lift coefficient): {cl}
+- CD (drag coefficient): {cd}
+- CM (moment coefficient): {cm}
+- L/D ratio: {ld:.1f}
+- Top transition: {top_xtr}
+- Bottom transition: {bot_xtr}
+
+Provide:
+1. Physical interpretation of these values
+2. What's happening with the flow (attached, separated, transitional?)
+3. How these compare to typical values
+4. Suggestions for further exploration
+
+Respond in under 600 words.
+"""
+
+
+class AITutorService:
+    """AI-powered CFD tutor using Claude or GPT-4"""
+
+    # System prompt for CFD tutoring; one shared string for every instance
+    # keeps the cached prompt prefix identical across requests and workers
+    system_prompt: ClassVar[str] = """You are an expert CFD (Computational Fluid Dynamics) tutor for AirfoilLearner,
 an educational platform for learning aerodynamics through interactive simulations.
 
 Your role:
@@ -76,11 +187,35 @@ Safety:
 Remember: You're teaching aerodynamics and CFD, not just answering questions.
 Foster curiosity and deep understanding."""
 
+    # Claude form of the prompt. On its own it is below the model's minimum
+    # cacheable length (1024 tokens for Sonnet), so this breakpoint only pays
+    # off with a longer prompt; conversations are cached by the history
+    # breakpoint in _build_messages
+    system_blocks: ClassVar[List[Dict]] = [
+        {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+    ]
+
+    def __init__(self):
+        self.provider = settings.AI_PROVIDER
+
+        if self.provider == "anthropic":
+            self.client = get_anthropic_client()
+            self.model = settings.AI_MODEL
+        elif self.provider == "openai":
+            self.client = get_openai_client()
+            self.model = settings.AI_MODEL
+        else:
+            raise ValueError(f"Unsupported AI provider: {self.provider}")
+
+        self.fast_model = settings.AI_FAST_MODEL or _DEFAULT_FAST_MODELS[self.provider]
+
     async def generate_response(
         self,
         user_message: str,
         conversation_history: List[Dict[str, str]],
-        context: Optional[Dict] = None
+        context: Optional[Dict] = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        model: Optional[str] = None
     ) -> str:
         """
         Generate AI tutor response
@@ -89,88 +224,182 @@ Foster curiosity and deep understanding."""
             user_message: Latest user message
             conversation_history: Previous messages [{"role": "user/assistant", "content": "..."}]
             context: Optional simulation/challenge context
+            max_tokens: Upper bound on the length of the reply
+            model: Override for the configured model (e.g. self.fast_model)
 
         Returns:
             AI-generated response
         """
-        # Build context-aware prompt
-        enhanced_message = self._enhance_message_with_context(user_message, context)
+        messages = self._build_messages(user_message, conversation_history, context)
+        model = model or self.model
+        key = orjson.dumps({"model": model, "max_tokens": max_tokens, "messages": messages}, option=orjson.OPT_SORT_KEYS)
+
+        # Prompts without history (concept explanations, hints, analyses) are
+        # the same for every user, so earlier answers are reused
+        cache_key = None
+        if not conversation_history:
+            cache_key = f"tutor:{self.provider}:{model}:{hashlib.sha256(key).hexdigest()}"
+            cached = await cache_get_json(cache_key)
+            if cached is not None:
+                return cached
+
+        # Identical requests already in flight share one API call
+        pending = _inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._generate(messages, max_tokens, model))
+            _inflight[key] = pending
+            pending.add_done_callback(lambda _: _inflight.pop(key, None))
+
+        # Shield so one caller disconnecting doesn't cancel the shared call
+        response = await asyncio.shield(pending)
+        if cache_key is not None:
+            await cache_set_json(cache_key, response)
+        return response
+
+    async def _generate(self, messages: List[Dict], max_tokens: int, model: str) -> str:
+        """Call the configured provider"""
+        if self.provider == "anthropic":
+            return await self._generate_anthropic(messages, max_tokens, model)
+        else:
+            return await self._generate_openai(messages, max_tokens, model)
 
-        # Prepare messages for API
-        messages = conversation_history + [
-            {"role": "user", "content": enhanced_message}
-        ]
+    async def stream_response(
+        self,
+        user_message: str,
+        conversation_history: List[Dict[str, str]],
+        context: Optional[Dict] = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS
+    ) -> AsyncIterator[str]:
+        """
+        Stream AI tutor response text as it is generated
+
+        Same arguments as generate_response; text is yielded as each provider
+        delta arrives, so the first words show after time-to-first-token
+        rather than after the whole reply is decoded.
+        """
+        messages = self._build_messages(user_message, conversation_history, context)
 
-        # Call appropriate API
         if self.provider == "anthropic":
-            return await self._generate_anthropic(messages)
+            async with self.client.messages.stream(
+                model=self.model,
+                max_tokens=max_tokens,
+                system=self.system_blocks,
+                messages=messages
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
         else:
-            return await self._generate_openai(messages)
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "system", "content": self.system_prompt}] + messages,
+                max_tokens=max_tokens,
+                temperature=0.7,
+                stream=True
+            )
+            async for chunk in stream:
+                # The final chunk may carry no choices, and role/stop chunks no content
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
 
-    def _enhance_message_with_context(
+    def _build_messages(
         self,
-        message: str,
+        user_message: str,
+        conversation_history: List[Dict[str, str]],
         context: Optional[Dict]
-    ) -> str:
-        """Add simulation/challenge context to user message"""
-        if not context:
-            return message
+    ) -> List[Dict[str, str]]:
+        """
+        Lay out the API message list
 
-        context_parts = [message, "\n\n[Context]"]
+        Providers cache by exact prefix bytes, so the order is fixed: static
+        system prompt (sent separately), then history, then the per-turn
+        context as its own message, then the user's message. Simulation data
+        must never go into the system prompt or earlier turns, or every
+        request would miss the cache from that point on.
+
+        For Claude the newest history message carries a rolling cache
+        breakpoint: system prompt plus history is written to the cache, and
+        the next turn (same history plus this exchange) reads it back.
+        """
+        messages = list(conversation_history)
+        if messages and self.provider == "anthropic":
+            last = messages[-1]
+            messages[-1] = {
+                "role": last["role"],
+                "content": [{"type": "text", "text": last["content"], "cache_control": {"type": "ephemeral"}}]
+            }
+        if context:
+            messages.append({"role": "user", "content": self._format_context(context)})
+        messages.append({"role": "user", "content": user_message})
+        return messages
+
+    def _format_context(self, context: Dict) -> str:
+        """Render simulation/challenge context as a deterministic text block"""
+        context_parts = ["[Context]"]
 
         # Add simulation context
         if "simulation" in context:
             sim = context["simulation"]
-            context_parts.append(
-                f"Current simulation: {sim.get('airfoil_designation', 'custom')} airfoil\n"
-                f"- Angle of attack: {sim.get('alpha')}°\n"
-                f"- Reynolds number: {sim.get('reynolds'):.2e}\n"
-                f"- Solver: {sim.get('solver_type')}\n"
-                f"- Status: {sim.get('status')}"
-            )
+            context_parts.append(_SIM_CTX_TMPL.format(
+                design=sim.get('airfoil_designation', 'custom'),
+                alpha=sim.get('alpha'),
+                re=sim.get('reynolds'),
+                solver=sim.get('solver_type'),
+                status=sim.get('status')
+            ))
 
             if sim.get("results"):
                 results = sim["results"]
-                context_parts.append(
-                    f"\nResults:\n"
-                    f"- CL: {results.get('cl', 'N/A')}\n"
-                    f"- CD: {results.get('cd', 'N/A')}\n"
-                    f"- CM: {results.get('cm', 'N/A')}\n"
-                    f"- Converged: {results.get('converged', False)}"
-                )
+                context_parts.append(_SIM_RESULTS_CTX_TMPL.format(
+                    cl=results.get('cl', 'N/A'),
+                    cd=results.get('cd', 'N/A'),
+                    cm=results.get('cm', 'N/A'),
+                    converged=results.get('converged', False)
+                ))
 
         # Add challenge context
         if "challenge" in context:
             ch = context["challenge"]
-            context_parts.append(
-                f"\nActive challenge: '{ch.get('title')}'\n"
-                f"- Difficulty: {ch.get('difficulty')}\n"
-                f"- Category: {ch.get('category')}"
-            )
+            context_parts.append(_CHALLENGE_CTX_TMPL.format(
+                title=ch.get('title'),
+                difficulty=ch.get('difficulty'),
+                category=ch.get('category')
+            ))
 
         return "\n".join(context_parts)
 
-    async def _generate_anthropic(self, messages: List[Dict]) -> str:
+    async def _generate_anthropic(
+        self,
+        messages: List[Dict],
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        model: Optional[str] = None
+    ) -> str:
         """Generate response using Claude"""
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=2000,
-            system=self.system_prompt,
+        response = await self.client.messages.create(
+            model=model or self.model,
+            max_tokens=max_tokens,
+            system=self.system_blocks,
             messages=messages
         )
 
         return response.content[0].text
 
-    async def _generate_openai(self, messages: List[Dict]) -> str:
+    async def _generate_openai(
+        self,
+        messages: List[Dict],
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        model: Optional[str] = None
+    ) -> str:
         """Generate response using GPT"""
+        # The system prompt is byte-identical on every call, so OpenAI's
+        # automatic prefix caching applies without any extra flags
         messages_with_system = [
             {"role": "system", "content": self.system_prompt}
         ] + messages
 
-        response = self.client.chat.completions.create(
-            model=self.model,
+        response = await self.client.chat.completions.create(
+            model=model or self.model,
             messages=messages_with_system,
-            max_tokens=2000,
+            max_tokens=max_tokens,
             temperature=0.7
         )
 
@@ -186,6 +415,8 @@ Foster curiosity and deep understanding."""
         Returns:
             Detailed explanation
         """
+        # Normalized so "Stall" and "stall " share one cached explanation
+        concept = " ".join(concept.lower().split())
         prompt = f"""Explain the CFD concept '{concept}' in a clear, educational way.
 Include:
 1. What it is (definition)
@@ -194,11 +425,13 @@ Include:
 4. Real-world examples
 5. Related concepts
 
-Use analogies and visual descriptions. Include relevant formulas in LaTeX."""
+Use analogies and visual descriptions. Include relevant formulas in LaTeX.
+Respond in under 400 words."""
 
         return await self.generate_response(
             user_message=prompt,
-            conversation_history=[]
+            conversation_history=[],
+            max_tokens=800
         )
 
     async def debug_simulation(
@@ -216,33 +449,33 @@ Use analogies and visual descriptions. Include relevant formulas in LaTeX."""
         Returns:
             Debugging suggestions
         """
-        prompt = f"""I'm having trouble with my CFD simulation. Here are the details:
-
-Airfoil: {simulation_data.get('airfoil_designation', 'custom')}
-Angle of attack: {simulation_data.get('alpha')}°
-Reynolds number: {simulation_data.get('reynolds'):.2e}
-Mach number: {simulation_data.get('mach', 0.0)}
-Solver: {simulation_data.get('solver_type')}
-Status: {simulation_data.get('status')}
-"""
+        parts = [_DEBUG_PROMPT_TMPL.format(
+            design=simulation_data.get('airfoil_designation', 'custom'),
+            alpha=simulation_data.get('alpha'),
+            re=simulation_data.get('reynolds'),
+            mach=simulation_data.get('mach', 0.0),
+            solver=simulation_data.get('solver_type'),
+            status=simulation_data.get('status')
+        )]
 
         if error_message:
-            prompt += f"\nError message: {error_message}"
+            parts.append(f"\nError message: {error_message}")
 
         if simulation_data.get("results"):
             results = simulation_data["results"]
-            prompt += f"""
-Results:
-- CL: {results.get('cl')}
-- CD: {results.get('cd')}
-- Converged: {results.get('converged', False)}
-"""
+            parts.append(_DEBUG_RESULTS_TMPL.format(
+                cl=results.get('cl'),
+                cd=results.get('cd'),
+                converged=results.get('converged', False)
+            ))
 
-        prompt += "\nWhat might be wrong and how can I fix it?"
+        parts.append("\nWhat might be wrong and how can I fix it? Respond in under 500 words.")
+        prompt = "".join(parts)
 
         return await self.generate_response(
             user_message=prompt,
-            conversation_history=[]
+            conversation_history=[],
+            max_tokens=1000
         )
 
     async def get_challenge_hint(
@@ -265,14 +498,17 @@ Results:
         # Use pre-defined hints if available
         if challenge.get("hints") and attempt_number <= len(challenge["hints"]):
             predefined_hint = challenge["hints"][attempt_number - 1]
+            # Rewording a fixed hint doesn't need the large model
+            model = self.fast_model
 
             # Enhance predefined hint with context
             prompt = f"""The user is working on the challenge '{challenge['title']}'
 (attempt #{attempt_number}). Give them this hint in an encouraging way: "{predefined_hint}"
 
-Add brief context about why this hint is important."""
+Add brief context about why this hint is important. Respond in under 150 words."""
         else:
             # Generate dynamic hint
+            model = None
             prompt = f"""The user is working on challenge '{challenge['title']}'
 ({challenge['difficulty']} difficulty, category: {challenge['category']}).
 
@@ -284,11 +520,13 @@ Attempt: #{attempt_number}
                 for i, result in enumerate(previous_results[-3:], 1):  # Last 3 attempts
                     prompt += f"  {i}. Alpha={result.get('alpha')}°, CL={result.get('cl')}, CD={result.get('cd')}\n"
 
-            prompt += "\nProvide a helpful hint (not the full solution) to guide them toward success."
+            prompt += "\nProvide a helpful hint (not the full solution) to guide them toward success. Respond in under 150 words."
 
         return await self.generate_response(
             user_message=prompt,
-            conversation_history=[]
+            conversation_history=[],
+            max_tokens=300,
+            model=model
         )
 
     async def analyze_results(self, simulation_data: Dict) -> str:
@@ -303,30 +541,22 @@ Attempt: #{attempt_number}
         """
         results = simulation_data.get("results", {})
 
-        prompt = f"""Analyze these CFD simulation results for {simulation_data.get('airfoil_designation')} airfoil:
-
-Parameters:
-- Angle of attack: {simulation_data.get('alpha')}°
-- Reynolds number: {simulation_data.get('reynolds'):.2e}
-
-Results:
-- CL (lift coefficient): {results.get('cl')}
-- CD (drag coefficient): {results.get('cd')}
-- CM (moment coefficient): {results.get('cm')}
-- L/D ratio: {results.get('cl', 0) / results.get('cd', 1):.1f}
-- Top transition: {results.get('top_xtr')}
-- Bottom transition: {results.get('bot_xtr')}
-
-Provide:
-1. Physical interpretation of these values
-2. What's happening with the flow (attached, separated, transitional?)
-3. How these compare to typical values
-4. Suggestions for further exploration
-"""
+        prompt = _ANALYZE_PROMPT_TMPL.format(
+            design=simulation_data.get('airfoil_designation'),
+            alpha=simulation_data.get('alpha'),
+            re=simulation_data.get('reynolds'),
+            cl=results.get('cl'),
+            cd=results.get('cd'),
+            cm=results.get('cm'),
+            ld=results.get('cl', 0) / results.get('cd', 1),
+            top_xtr=results.get('top_xtr'),
+            bot_xtr=results.get('bot_xtr')
+        )
 
         return await self.generate_response(
             user_message=prompt,
-            conversation_history=[]
+            conversation_history=[],
+            max_tokens=1200
         )
 
 
@@ -1,9 +1,12 @@
 import numpy as np
+import orjson
 import re
 from typing import Dict, List
 from dataclasses import dataclass
 from app.utils.neuralfoil_wrapper import get_predictor, create_naca_airfoil
 
+_NACA4_RE = re.compile(r'naca\s*(\d{4})')
+
 @dataclass
 class SimulationCondition:
     alpha: float
@@ -16,12 +19,28 @@ class FreeAirfoilAgent:
         self.predictor = get_predictor()
         self.simulation_history = []
     
+    def to_json(self) -> bytes:
+        # Plain data only; the predictor is stateless and rebuilt on load
+        return orjson.dumps(
+            {"current_airfoil": self.current_airfoil, "simulation_history": self.simulation_history},
+            option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    
+    @classmethod
+    def from_json(cls, data: bytes) -> "FreeAirfoilAgent":
+        state = orjson.loads(data)
+        agent = cls()
+        if state.get("current_airfoil") is not None:
+            agent.current_airfoil = np.asarray(state["current_airfoil"], dtype=np.float32)
+        agent.simulation_history = state.get("simulation_history", [])
+        return agent
+    
     def process_command(self, command: str) -> Dict:
         command = command.lower().strip()
         if "generate" in command or "create" in command:
-            naca_match = re.search(r'naca\s*(\d{4})', command)
+            naca_match = _NACA4_RE.search(command)
             if naca_match:
-                return self.generate_airfoil(f"NACA {naca_match.group(1)}")
+                return self._generate_naca(naca_match.group(1))
             return {"error": "Could not parse NACA code"}
         elif "test" in command or "simulate" in command:
             conditions = self._parse_conditions(command)
@@ -31,20 +50,25 @@ class FreeAirfoilAgent:
         return {"error": "Command not recognized"}
     
     def generate_airfoil(self, description: str) -> Dict:
-        naca_match = re.search(r'naca\s*(\d{4})', description.lower())
+        naca_match = _NACA4_RE.search(description.lower())
         if naca_match:
-            naca_code = naca_match.group(1)
-            coords = create_naca_airfoil(naca_code)
-            self.current_airfoil = coords
-            return {"action": "generate", "success": True, "airfoil": {"coordinates": coords.tolist(), "type": "naca", "designation": f"NACA {naca_code}"}, "message": f"Generated NACA {naca_code}"}
+            return self._generate_naca(naca_match.group(1))
         return {"error": "Could not parse airfoil description"}
     
+    def _generate_naca(self, naca_code: str) -> Dict:
+        # process_command has already lowercased and parsed the code;
+        # coordinates stay an ndarray for the endpoint to serialize with orjson
+        coords = create_naca_airfoil(naca_code)
+        self.current_airfoil = coords
+        return {"action": "generate", "success": True, "airfoil": {"coordinates": coords, "type": "naca", "designation": f"NACA {naca_code}"}, "message": f"Generated NACA {naca_code}"}
+    
     def run_simulations(self, conditions: List[SimulationCondition]) -> Dict:
         if self.current_airfoil is None:
             return {"error": "No airfoil generated yet"}
+        # One vectorized NeuralFoil call covers every condition
+        raw = self.predictor.predict_many(self.current_airfoil, [c.alpha for c in conditions], [c.reynolds for c in conditions])
         results = []
-        for cond in conditions:
-            result = self.predictor.predict(self.current_airfoil, cond.alpha, cond.reynolds, 0.0)
+        for cond, result in zip(conditions, raw):
             results.append({"condition": cond.name, "alpha": cond.alpha, "reynolds": cond.reynolds, "metrics": {"CL": result['CL'], "CD": result['CD'], "CM": result['CM'], "L_D": result['L_D'], "stall_risk": self._assess_stall(result['CL'], cond.alpha), "efficiency_rating": self._rate_efficiency(result['L_D'])}, "time_ms": result['time_ms']})
         self.simulation_history.extend(results)
         return {"action": "simulate", "success": True, "results": results, "message": f"Completed {len(results)} simulations"}
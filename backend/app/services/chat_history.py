@@ -0,0 +1,53 @@
+"""
+Chat history streaming - Server-Sent Events over stored ChatMessage rows
+
+Long conversations are sent row by row as they are read from the database,
+so neither the server nor the client holds the whole history at once and
+the first message arrives after one round trip instead of after the last.
+"""
+
+from typing import AsyncIterator, Optional
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ChatMessage
+
+
+# Rows fetched per round trip from the server-side cursor
+HISTORY_BATCH_SIZE = 100
+
+
+async def stream_chat_history(
+    session: AsyncSession,
+    simulation_id: str,
+    user_id: Optional[str] = None
+) -> AsyncIterator[bytes]:
+    """
+    Yield a simulation's chat history as SSE events, oldest first
+
+    Each event carries {"role", "content", "timestamp"}; the stream ends
+    with {"done": true}. Intended for StreamingResponse(..., media_type="text/event-stream").
+
+    Args:
+        session: Database session (kept open for the life of the stream)
+        simulation_id: Simulation the conversation belongs to
+        user_id: Restrict to one user's messages
+
+    Yields:
+        Encoded "data: ...\\n\\n" SSE frames
+    """
+    query = (
+        select(ChatMessage.role, ChatMessage.content, ChatMessage.timestamp)
+        .where(ChatMessage.simulation_id == simulation_id)
+        .order_by(ChatMessage.timestamp)
+        .execution_options(yield_per=HISTORY_BATCH_SIZE)
+    )
+    if user_id is not None:
+        query = query.where(ChatMessage.user_id == user_id)
+
+    result = await session.stream(query)
+    async for role, content, timestamp in result:
+        yield b"data: " + orjson.dumps({"role": role.value, "content": content, "timestamp": timestamp}) + b"\n\n"
+    yield b'data: {"done":true}\n\n'
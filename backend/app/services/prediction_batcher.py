@@ -0,0 +1,112 @@
+"""
+Micro-batching for single-point NeuralFoil predictions
+
+Concurrent requests that arrive within a short window are grouped by airfoil
+and each group is evaluated with one vectorized predictor call, so the model
+runs once per batch instead of once per request.
+"""
+
+import asyncio
+import contextlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from app.utils.neuralfoil_wrapper import get_predictor
+
+
+# (coordinates, alpha, reynolds, future awaiting the result)
+_Pending = Tuple[np.ndarray, float, float, asyncio.Future]
+
+
+class PredictionBatcher:
+    """Coalesces concurrent predict() calls into vectorized predict_many() calls"""
+
+    def __init__(self, window_ms: float = 5.0, max_batch: int = 64):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def predict(self, coordinates: np.ndarray, alpha: float, reynolds: float) -> Dict[str, Any]:
+        """Queue one prediction and wait for the batch it lands in"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        self._queue.put_nowait((coordinates, float(alpha), float(reynolds), future))
+        return await future
+
+    async def close(self):
+        """Stop the worker; predictions still waiting are cancelled"""
+        worker, self._worker = self._worker, None
+        if worker is not None and not worker.done():
+            worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch: List[_Pending] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.window
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                try:
+                    groups = await run_in_threadpool(self._evaluate, batch)
+                except Exception as e:
+                    # e.g. the predictor failed to load: fail this batch, keep serving
+                    groups = [(batch, [e] * len(batch))]
+                for pending, outcome in groups:
+                    for (_, _, _, future), result in zip(pending, outcome):
+                        if future.done():
+                            continue  # caller went away
+                        if isinstance(result, Exception):
+                            future.set_exception(result)
+                        else:
+                            future.set_result(result)
+        finally:
+            # Shutting down: nothing will answer the current batch or the queue
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    @staticmethod
+    def _evaluate(batch: List[_Pending]) -> List[Tuple[List[_Pending], List[Any]]]:
+        """Run one predict_many per airfoil; cached airfoils share one array object"""
+        groups: Dict[int, List[_Pending]] = {}
+        for item in batch:
+            groups.setdefault(id(item[0]), []).append(item)
+
+        predictor = get_predictor()
+        outcomes = []
+        for pending in groups.values():
+            try:
+                results = predictor.predict_many(
+                    pending[0][0],
+                    [item[1] for item in pending],
+                    [item[2] for item in pending]
+                )
+            except Exception as e:
+                results = [e] * len(pending)
+            outcomes.append((pending, results))
+        return outcomes
+
+
+prediction_batcher = PredictionBatcher()
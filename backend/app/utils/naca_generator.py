@@ -8,9 +8,49 @@ Supports:
 """
 
 import numpy as np
+from functools import lru_cache
 from typing import Tuple
 
 
+@lru_cache(maxsize=16)
+def _x_grid(num_points: int, cosine_spacing: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Chordwise stations and their square roots, shared by every designation
+
+    Only a handful of (num_points, spacing) combinations are ever requested,
+    so each grid is built once and reused read-only across generator calls.
+    """
+    if cosine_spacing:
+        # Cosine spacing for better resolution at LE and TE
+        beta = np.linspace(0, np.pi, num_points)
+        x = 0.5 * (1 - np.cos(beta))
+    else:
+        # Linear spacing
+        x = np.linspace(0, 1, num_points)
+
+    sqrt_x = np.sqrt(x)
+    x.setflags(write=False)
+    sqrt_x.setflags(write=False)
+    return x, sqrt_x
+
+
+def _assemble_surfaces(xu: np.ndarray, yu: np.ndarray, xl: np.ndarray, yl: np.ndarray) -> np.ndarray:
+    """
+    Write upper (TE -> LE) then lower (LE -> TE, shared LE point dropped)
+    surfaces straight into one (2N-1)x2 array, without temporaries
+    """
+    n = len(xu)
+    coords = np.empty((2 * n - 1, 2))
+    coords[:n, 0] = xu[::-1]
+    coords[:n, 1] = yu[::-1]
+    coords[n:, 0] = xl[1:]
+    coords[n:, 1] = yl[1:]
+    # Shared between callers via the cache, so guard against in-place edits
+    coords.setflags(write=False)
+    return coords
+
+
+@lru_cache(maxsize=128)
 def generate_naca_4digit(
     designation: str,
     num_points: int = 100,
@@ -25,7 +65,8 @@ def generate_naca_4digit(
         cosine_spacing: Use cosine spacing for better leading edge resolution
 
     Returns:
-        Nx2 array of [x, y] coordinates (starting from TE top, going around to TE bottom)
+        Nx2 read-only array of [x, y] coordinates (starting from TE top, going around to TE bottom);
+        results are cached per (designation, num_points, cosine_spacing)
     """
     if len(designation) != 4:
         raise ValueError("NACA 4-digit designation must be 4 digits")
@@ -35,24 +76,12 @@ def generate_naca_4digit(
     p = int(designation[1]) / 10   # Location of maximum camber (as fraction of chord)
     t = int(designation[2:]) / 100  # Maximum thickness (as fraction of chord)
 
-    # Generate x coordinates
-    if cosine_spacing:
-        # Cosine spacing for better resolution at LE and TE
-        beta = np.linspace(0, np.pi, num_points)
-        x = 0.5 * (1 - np.cos(beta))
-    else:
-        # Linear spacing
-        x = np.linspace(0, 1, num_points)
+    # Generate x coordinates (cached per grid shape)
+    x, sqrt_x = _x_grid(num_points, cosine_spacing)
 
-    # Calculate thickness distribution using NACA formula
-    yt = 5 * t * (
-        0.2969 * np.sqrt(x) -
-        0.1260 * x -
-        0.3516 * x**2 +
-        0.2843 * x**3 -
-        0.1015 * x**4  # Original NACA (sharp TE)
-        # 0.1036 * x**4  # Modified for closed TE
-    )
+    # Calculate thickness distribution using NACA formula, polynomial part in Horner form
+    # (-0.1015 is the original sharp-TE coefficient; -0.1036 closes the TE)
+    yt = 5 * t * (0.2969 * sqrt_x + x * (-0.1260 + x * (-0.3516 + x * (0.2843 + x * -0.1015))))
 
     # Calculate camber line
     if m == 0:
@@ -60,36 +89,38 @@ def generate_naca_4digit(
         yc = np.zeros_like(x)
         dyc_dx = np.zeros_like(x)
     else:
-        # Cambered airfoil
-        yc = np.where(
-            x < p,
-            m / p**2 * (2 * p * x - x**2),
-            m / (1 - p)**2 * ((1 - 2 * p) + 2 * p * x - x**2)
-        )
-
-        dyc_dx = np.where(
-            x < p,
-            2 * m / p**2 * (p - x),
-            2 * m / (1 - p)**2 * (p - x)
-        )
+        # Cambered airfoil: x is increasing, so split once at p and evaluate
+        # each branch only on its own points
+        k = int(np.searchsorted(x, p))
+        x1, x2 = x[:k], x[k:]
+        yc = np.empty_like(x)
+        dyc_dx = np.empty_like(x)
+
+        if k:  # p == 0 (e.g. "2012") leaves no forward segment
+            yc[:k] = m / p**2 * x1 * (2 * p - x1)
+            dyc_dx[:k] = 2 * m / p**2 * (p - x1)
+        yc[k:] = m / (1 - p)**2 * ((1 - 2 * p) + x2 * (2 * p - x2))
+        dyc_dx[k:] = 2 * m / (1 - p)**2 * (p - x2)
 
     # Calculate upper and lower surface coordinates
-    theta = np.arctan(dyc_dx)
+    # theta = arctan(dyc_dx), so cos(theta) = 1/sqrt(1 + dyc_dx^2) and
+    # sin(theta) = dyc_dx * cos(theta); no trig calls needed
+    cos_theta = 1 / np.sqrt(1 + dyc_dx * dyc_dx)
+    yt_cos = yt * cos_theta
+    yt_sin = yt_cos * dyc_dx
 
-    xu = x - yt * np.sin(theta)
-    yu = yc + yt * np.cos(theta)
+    xu = x - yt_sin
+    yu = yc + yt_cos
 
-    xl = x + yt * np.sin(theta)
-    yl = yc - yt * np.cos(theta)
+    xl = x + yt_sin
+    yl = yc - yt_cos
 
     # Combine coordinates (upper surface + lower surface reversed)
     # XFoil expects: start at TE (top), go around LE, end at TE (bottom)
-    x_coords = np.concatenate([xu[::-1], xl[1:]])
-    y_coords = np.concatenate([yu[::-1], yl[1:]])
-
-    return np.column_stack([x_coords, y_coords])
+    return _assemble_surfaces(xu, yu, xl, yl)
 
 
+@lru_cache(maxsize=128)
 def generate_naca_5digit(
     designation: str,
     num_points: int = 100,
@@ -104,7 +135,7 @@ def generate_naca_5digit(
         cosine_spacing: Use cosine spacing for better leading edge resolution
 
     Returns:
-        Nx2 array of [x, y] coordinates
+        Nx2 read-only array of [x, y] coordinates (cached like generate_naca_4digit)
     """
     if len(designation) != 5:
         raise ValueError("NACA 5-digit designation must be 5 digits")
@@ -115,21 +146,11 @@ def generate_naca_5digit(
     reflex = designation[2] == '1'  # Reflex camber flag
     t = int(designation[3:]) / 100  # Thickness
 
-    # Generate x coordinates
-    if cosine_spacing:
-        beta = np.linspace(0, np.pi, num_points)
-        x = 0.5 * (1 - np.cos(beta))
-    else:
-        x = np.linspace(0, 1, num_points)
+    # Generate x coordinates (cached per grid shape)
+    x, sqrt_x = _x_grid(num_points, cosine_spacing)
 
-    # Thickness distribution (same as 4-digit)
-    yt = 5 * t * (
-        0.2969 * np.sqrt(x) -
-        0.1260 * x -
-        0.3516 * x**2 +
-        0.2843 * x**3 -
-        0.1015 * x**4
-    )
+    # Thickness distribution (same as 4-digit, Horner form)
+    yt = 5 * t * (0.2969 * sqrt_x + x * (-0.1260 + x * (-0.3516 + x * (0.2843 + x * -0.1015))))
 
     # Mean camber line parameters (standard NACA 5-digit)
     if not reflex:
@@ -137,17 +158,16 @@ def generate_naca_5digit(
         m = 0.0580  # Scaling factor
         k1 = 361.4
 
-        yc = np.where(
-            x < p,
-            k1 / 6 * (x**3 - 3 * m * x**2 + m**2 * (3 - m) * x),
-            k1 / 6 * m**3 * (1 - x)
-        )
-
-        dyc_dx = np.where(
-            x < p,
-            k1 / 6 * (3 * x**2 - 6 * m * x + m**2 * (3 - m)),
-            -k1 / 6 * m**3 * np.ones_like(x)
-        )
+        c = m**2 * (3 - m)
+        k = int(np.searchsorted(x, p))
+        x1, x2 = x[:k], x[k:]
+        yc = np.empty_like(x)
+        dyc_dx = np.empty_like(x)
+
+        yc[:k] = k1 / 6 * x1 * (c + x1 * (-3 * m + x1))
+        yc[k:] = k1 / 6 * m**3 * (1 - x2)
+        dyc_dx[:k] = k1 / 6 * (c + x1 * (-6 * m + 3 * x1))
+        dyc_dx[k:] = -k1 / 6 * m**3
     else:
         # Reflex camber (simplified)
         yc = np.zeros_like(x)
@@ -157,18 +177,19 @@ def generate_naca_5digit(
     yc = yc * cl_ideal / 0.3
 
     # Calculate surface coordinates
-    theta = np.arctan(dyc_dx)
+    # theta = arctan(dyc_dx), so cos(theta) = 1/sqrt(1 + dyc_dx^2) and
+    # sin(theta) = dyc_dx * cos(theta); no trig calls needed
+    cos_theta = 1 / np.sqrt(1 + dyc_dx * dyc_dx)
+    yt_cos = yt * cos_theta
+    yt_sin = yt_cos * dyc_dx
 
-    xu = x - yt * np.sin(theta)
-    yu = yc + yt * np.cos(theta)
+    xu = x - yt_sin
+    yu = yc + yt_cos
 
-    xl = x + yt * np.sin(theta)
-    yl = yc - yt * np.cos(theta)
+    xl = x + yt_sin
+    yl = yc - yt_cos
 
-    x_coords = np.concatenate([xu[::-1], xl[1:]])
-    y_coords = np.concatenate([yu[::-1], yl[1:]])
-
-    return np.column_stack([x_coords, y_coords])
+    return _assemble_surfaces(xu, yu, xl, yl)
 
 
 def load_custom_airfoil(filepath: str) -> np.ndarray:
@@ -185,6 +206,13 @@ def load_custom_airfoil(filepath: str) -> np.ndarray:
     Returns:
         Nx2 array of [x, y] coordinates
     """
+    # Fast path: well-formed files parse in C (blank and '#' lines are skipped)
+    try:
+        return np.loadtxt(filepath, comments='#', skiprows=1, usecols=(0, 1), ndmin=2)
+    except ValueError:
+        pass
+
+    # Tolerant fallback for files with stray text or single-value lines
     with open(filepath, 'r') as f:
         lines = f.readlines()
 
@@ -269,19 +297,20 @@ def calculate_geometric_properties(coords: np.ndarray) -> dict:
     upper = coords[:le_idx + 1]
     lower = coords[le_idx:]
 
-    # Maximum thickness
-    max_thickness = 0
-    max_thickness_location = 0
-
-    for xi in np.linspace(0, 1, 100):
-        # Interpolate y at this x for upper and lower surfaces
-        y_upper = np.interp(xi, upper[:, 0], upper[:, 1])
-        y_lower = np.interp(xi, lower[:, 0], lower[:, 1])
-
-        thickness = y_upper - y_lower
-        if thickness > max_thickness:
-            max_thickness = thickness
-            max_thickness_location = xi
+    # Maximum thickness: interpolate both surfaces on the whole grid at once
+    # (np.interp needs increasing x, and the upper surface runs TE -> LE)
+    xi = np.linspace(0, 1, 100)
+    y_upper = np.interp(xi, upper[::-1, 0], upper[::-1, 1])
+    y_lower = np.interp(xi, lower[:, 0], lower[:, 1])
+    thickness = y_upper - y_lower
+
+    k = int(np.argmax(thickness))
+    if thickness[k] > 0:
+        max_thickness = thickness[k]
+        max_thickness_location = xi[k]
+    else:
+        max_thickness = 0
+        max_thickness_location = 0
 
     # Leading edge radius (approximate)
     le_x = x[le_idx]
@@ -299,6 +328,16 @@ def calculate_geometric_properties(coords: np.ndarray) -> dict:
     }
 
 
+def _warm_preset_cache():
+    """Generate every preset once so the first request for one is a cache hit"""
+    generators = {"4digit": generate_naca_4digit, "5digit": generate_naca_5digit}
+    for info in get_preset_airfoils().values():
+        generators[info["type"]](info["code"])
+
+
+_warm_preset_cache()
+
+
 if __name__ == "__main__":
     # Test NACA generators
     print("Generating NACA 0012...")
@@ -1,30 +1,41 @@
 import numpy as np
-import time
+from time import perf_counter
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any
 
+@lru_cache(maxsize=None)
+def _get_aero_fn():
+    """Imports NeuralFoil on the first real prediction, then reuses the resolved function."""
+    try:
+        from neuralfoil import get_aero_from_coordinates
+    except ImportError:
+        from neuralfoil.main import get_aero_from_coordinates
+    return get_aero_from_coordinates
+
+def _lift_to_drag(cl: np.ndarray, cd: np.ndarray) -> np.ndarray:
+    """Elementwise CL/CD, 0 where CD is effectively zero (same rule as predict)."""
+    ld = np.zeros_like(cl)
+    np.divide(cl, cd, out=ld, where=cd > 1e-6)
+    return ld
+
 class NeuralFoilPredictor:
     def predict(self, coordinates, alpha, reynolds, mach=0.0) -> Dict[str, Any]:
         """Predicts aerodynamic performance using NeuralFoil."""
-        try:
-            from neuralfoil import get_aero_from_coordinates
-        except ImportError:
-            from neuralfoil.main import get_aero_from_coordinates
+        get_aero_from_coordinates = _get_aero_fn()
 
         alpha_val = float(alpha)
         reynolds_val = float(reynolds)
         
-        if not isinstance(coordinates, np.ndarray):
-            coords_array = np.array(coordinates, dtype=np.float32)
-        else:
-            coords_array = coordinates.astype(np.float32)
+        # No copy when the caller already passes contiguous float32 (the cached builders do)
+        coords_array = np.ascontiguousarray(coordinates, dtype=np.float32)
 
-        start = time.time()
+        start = perf_counter()
         result = get_aero_from_coordinates(
             coordinates=coords_array,
             alpha=alpha_val,
             Re=reynolds_val
         )
-        elapsed_ms = (time.time() - start) * 1000
+        elapsed_ms = (perf_counter() - start) * 1000
 
         def to_float(val):
             return float(val.item()) if hasattr(val, 'item') else float(val)
@@ -43,99 +54,171 @@ class NeuralFoilPredictor:
             'solver': 'NeuralFoil'
         }
     
-    def predict_polar(self, coordinates, alpha_range: Tuple[float, float], alpha_step: float, reynolds: float) -> List[Dict]:
-        """Generate polar curve data"""
-        results = []
+    def _predict_arrays(self, coordinates, alphas, reynolds) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]:
+        """Runs one vectorized NeuralFoil call; returns contiguous (alpha, CL, CD, CM) arrays and elapsed ms."""
+        get_aero_from_coordinates = _get_aero_fn()
+
+        alpha_vals = np.asarray(alphas, dtype=np.float64)
+        reynolds_vals = np.asarray(reynolds, dtype=np.float64)
+
+        # No copy when the caller already passes contiguous float32 (the cached builders do)
+        coords_array = np.ascontiguousarray(coordinates, dtype=np.float32)
+
+        start = perf_counter()
+        result = get_aero_from_coordinates(
+            coordinates=coords_array,
+            alpha=alpha_vals,
+            Re=reynolds_vals
+        )
+        elapsed_ms = (perf_counter() - start) * 1000
+
+        # Scalar outputs broadcast to one value per alpha; copy so orjson can serialize them
+        n = len(alpha_vals)
+        cl = np.broadcast_to(np.asarray(result['CL'], dtype=np.float64).ravel(), (n,)).copy()
+        cd = np.broadcast_to(np.asarray(result['CD'], dtype=np.float64).ravel(), (n,)).copy()
+        cm = np.broadcast_to(np.asarray(result['CM'], dtype=np.float64).ravel(), (n,)).copy()
+
+        return alpha_vals, cl, cd, cm, elapsed_ms
+
+    def predict_many(self, coordinates, alphas, reynolds) -> List[Dict[str, Any]]:
+        """Predicts several (alpha, Re) points for one airfoil in a single vectorized NeuralFoil call."""
+        _, cl, cd, cm, elapsed_ms = self._predict_arrays(coordinates, alphas, reynolds)
+
+        return [
+            {
+                'CL': float(cl[i]),
+                'CD': float(cd[i]),
+                'CM': float(cm[i]),
+                'L_D': float(cl[i] / cd[i]) if cd[i] > 1e-6 else 0.0,
+                'time_ms': elapsed_ms,
+                'converged': True,
+                'solver': 'NeuralFoil'
+            }
+            for i in range(len(cl))
+        ]
+    
+    def predict_polar(self, coordinates, alpha_range: Tuple[float, float], alpha_step: float, reynolds: float) -> List[Dict[str, Any]]:
+        """Generate polar curve data (one predict()-style point per alpha)"""
         alpha_min, alpha_max = alpha_range
         alphas = np.arange(alpha_min, alpha_max + alpha_step, alpha_step)
         
-        for alpha in alphas:
-            result = self.predict(coordinates, alpha, reynolds)
-            result['alpha'] = float(alpha)
-            results.append(result)
+        # One vectorized evaluation; only the response is built per point
+        alphas, cl, cd, cm, elapsed_ms = self._predict_arrays(coordinates, alphas, reynolds)
         
-        return results
+        ld = _lift_to_drag(cl, cd)
+        
+        return [
+            {
+                'CL': point_cl,
+                'CD': point_cd,
+                'CM': point_cm,
+                'L_D': point_ld,
+                'time_ms': elapsed_ms,
+                'converged': True,
+                'solver': 'NeuralFoil',
+                'alpha': point_alpha
+            }
+            for point_alpha, point_cl, point_cd, point_cm, point_ld in zip(
+                alphas.tolist(), cl.tolist(), cd.tolist(), cm.tolist(), ld.tolist()
+            )
+        ]
     
     def optimize_for_ld(self, base_coordinates, reynolds: float, alpha: float, n_iterations: int) -> Dict:
         """Simple L/D optimization"""
-        best_ld = 0
-        best_result = None
+        test_alphas = np.linspace(alpha - 2, alpha + 2, n_iterations)
+        # Whole sweep in one vectorized forward pass, scored without a Python loop
+        test_alphas, cl, cd, _, _ = self._predict_arrays(base_coordinates, test_alphas, reynolds)
         
-        for test_alpha in np.linspace(alpha - 2, alpha + 2, n_iterations):
-            result = self.predict(base_coordinates, test_alpha, reynolds)
-            if result['L_D'] > best_ld:
-                best_ld = result['L_D']
-                best_result = result.copy()
-                best_result['alpha'] = float(test_alpha)
+        ld = _lift_to_drag(cl, cd)
+        best = int(np.argmax(ld))
         
         return {
-            'best_alpha': best_result['alpha'],
-            'best_L_D': best_ld,
-            'CL': best_result['CL'],
-            'CD': best_result['CD'],
-            'coordinates': base_coordinates.tolist()
+            'best_alpha': float(test_alphas[best]),
+            'best_L_D': float(ld[best]),
+            'CL': float(cl[best]),
+            'CD': float(cd[best]),
+            # Left as an ndarray; the API serializes it with orjson
+            'coordinates': base_coordinates
         }
 
+@lru_cache(maxsize=None)
 def get_predictor():
+    """Returns the process-wide predictor (it holds no per-request state)."""
     return NeuralFoilPredictor()
 
-def create_naca_airfoil(designation: str, n_points: int = 100) -> np.ndarray:
-    """Generates coordinates for a NACA 4-digit airfoil."""
-    if not designation or len(designation) != 4:
-        designation = "0012"
-
-    m = int(designation[0]) / 100
-    p = int(designation[1]) / 10
-    t = int(designation[2:4]) / 100
-
-    beta = np.linspace(0, np.pi, n_points // 2)
+@lru_cache(maxsize=8)
+def _cosine_grid(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Cosine-spaced chord stations and their square roots for n points (cached, read-only)."""
+    beta = np.linspace(0, np.pi, n, dtype=np.float32)
     x = (1 - np.cos(beta)) / 2
-    yt = 5*t*(0.2969*np.sqrt(x)-0.1260*x-0.3516*x**2+0.2843*x**3-0.1015*x**4)
+    sqrt_x = np.sqrt(x)
+    x.setflags(write=False)
+    sqrt_x.setflags(write=False)
+    return x, sqrt_x
+
+def _naca_coords(m: float, p: float, t: float, n_points: int) -> np.ndarray:
+    """Shared NACA 4-digit-style builder: camber m at chord position p, thickness t (read-only output)."""
+    # Built in float32 end to end: NeuralFoil consumes float32, so there is
+    # no float64 pass to narrow afterwards
+    m, p, t = np.float32(m), np.float32(p), np.float32(t)
+    x, sqrt_x = _cosine_grid(n_points // 2)
+    # Thickness polynomial in Horner form: one multiply-add per term, no powers
+    yt = 5*t*(0.2969*sqrt_x + x*(-0.1260 + x*(-0.3516 + x*(0.2843 + x*-0.1015))))
     
-    if p == 0:
+    # p == 0 (e.g. "2012") is treated as uncambered, like m == 0
+    if m == 0 or p == 0:
         yc = np.zeros_like(x)
         dyc_dx = np.zeros_like(x)
     else:
-        yc = np.where(x < p, m/p**2*(2*p*x-x**2), m/(1-p)**2*((1-2*p)+2*p*x-x**2))
-        dyc_dx = np.where(x < p, 2*m/p**2*(p-x), 2*m/(1-p)**2*(p-x))
+        # x is increasing: split once at p and evaluate each arm on its own slice
+        k = int(np.searchsorted(x, p))
+        x1, x2 = x[:k], x[k:]
+        yc = np.empty_like(x)
+        dyc_dx = np.empty_like(x)
+        yc[:k] = m/p**2*x1*(2*p-x1)
+        yc[k:] = m/(1-p)**2*((1-2*p)+x2*(2*p-x2))
+        dyc_dx[:k] = 2*m/p**2*(p-x1)
+        dyc_dx[k:] = 2*m/(1-p)**2*(p-x2)
     
-    theta = np.arctan(dyc_dx)
-    xu = x - yt*np.sin(theta)
-    yu = yc + yt*np.cos(theta)
-    xl = x + yt*np.sin(theta)
-    yl = yc - yt*np.cos(theta)
+    # With theta = arctan(dyc_dx): cos = 1/sqrt(1 + dyc_dx^2), sin = dyc_dx*cos,
+    # so the rotation needs one sqrt and no trig calls
+    yt_cos = yt / np.sqrt(1 + dyc_dx*dyc_dx)
+    yt_sin = yt_cos*dyc_dx
+    xu = x - yt_sin
+    yu = yc + yt_cos
+    xl = x + yt_sin
+    yl = yc - yt_cos
     
-    upper = np.column_stack((xu[::-1], yu[::-1]))
-    lower = np.column_stack((xl[1:], yl[1:]))
-    
-    return np.concatenate([upper, lower])
+    # Upper surface TE -> LE, then lower LE -> TE, written into one buffer
+    n = len(x)
+    coords = np.empty((2*n - 1, 2), dtype=np.float32)
+    coords[:n, 0] = xu[::-1]
+    coords[:n, 1] = yu[::-1]
+    coords[n:, 0] = xl[1:]
+    coords[n:, 1] = yl[1:]
+    # Shared between callers via the caches below, so guard against in-place edits
+    coords.setflags(write=False)
+    return coords
+
+@lru_cache(maxsize=256)
+def create_naca_airfoil(designation: str, n_points: int = 100) -> np.ndarray:
+    """Generates coordinates for a NACA 4-digit airfoil (cached, read-only)."""
+    if not designation or len(designation) != 4:
+        designation = "0012"
 
+    m = int(designation[0]) / 100
+    p = int(designation[1]) / 10
+    t = int(designation[2:4]) / 100
+    return _naca_coords(m, p, t, n_points)
+
+@lru_cache(maxsize=128)
 def create_custom_airfoil(camber: float = 0.04, thickness: float = 0.12, n_points: int = 100) -> np.ndarray:
-    """Generates a simple custom airfoil."""
-    m = camber
-    p = 0.4
-    t = thickness
-    
-    beta = np.linspace(0, np.pi, n_points // 2)
-    x = (1 - np.cos(beta)) / 2
-    yt = 5*t*(0.2969*np.sqrt(x)-0.1260*x-0.3516*x**2+0.2843*x**3-0.1015*x**4)
-    
-    if m == 0:
-        yc = np.zeros_like(x)
-        dyc_dx = np.zeros_like(x)
-    else:
-        yc = np.where(x<p, m/p**2*(2*p*x-x**2), m/(1-p)**2*((1-2*p)+2*p*x-x**2))
-        dyc_dx = np.where(x<p, 2*m/p**2*(p-x), 2*m/(1-p)**2*(p-x))
-    
-    theta = np.arctan(dyc_dx)
-    xu = x - yt*np.sin(theta)
-    yu = yc + yt*np.cos(theta)
-    xl = x + yt*np.sin(theta)
-    yl = yc - yt*np.cos(theta)
-    return np.column_stack([np.concatenate([xu[::-1],xl[1:]]), np.concatenate([yu[::-1],yl[1:]])])
+    """Generates a simple custom airfoil (cached, read-only)."""
+    return _naca_coords(camber, 0.4, thickness, n_points)
 
+@lru_cache(maxsize=64)
 def get_preset_coordinates(preset_name: str) -> np.ndarray:
-    """Returns coordinates for a known preset name."""
+    """Returns coordinates for a known preset name (cached, read-only)."""
     preset_name = preset_name.lower().strip()
     
     if preset_name in PRESETS:
@@ -1,17 +1,48 @@
 """
 XFoil Wrapper for AirfoilLearner
 Handles XFoil subprocess execution and result parsing
+
+When the optional `xfoil` Python package (compiled XFoil library) is
+installed, analyses run in-process instead of spawning the executable.
 """
 
+import asyncio
+import hashlib
 import os
 import re
+import shutil
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
+from cachetools import LRUCache
+
+try:
+    from xfoil import XFoil
+    from xfoil.model import Airfoil
+except ImportError:  # optional; fall back to the xfoil executable
+    XFoil = None
+
+# The compiled library keeps its state in Fortran globals, so one instance
+# per process is shared and calls into it are serialized
+_inprocess_xfoil = None
+_inprocess_lock = threading.Lock()
+
+# Fewer alphas than this per XFoil process loses more to cold starts than
+# parallelism gains
+MIN_ALPHAS_PER_SHARD = 4
+
+# Paneled geometries kept per wrapper (one small .dat file each)
+MAX_PANEL_CACHE = 256
+
+# Converged single-alpha results kept per wrapper
+MAX_RESULT_CACHE = 4096
 
 
 @dataclass
@@ -25,15 +56,66 @@ class XFoilResults:
     top_xtr: float  # Top transition point
     bot_xtr: float  # Bottom transition point
     converged: bool
-    cp_distribution: Optional[np.ndarray] = None  # [x, y, Cp]
+    cp_distribution: Optional[np.ndarray] = None  # (N, 3) float32 [x, y, Cp]
     bl_data: Optional[Dict] = None  # Boundary layer data
 
+    @property
+    def cp_columns(self) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """x, y and Cp as separate arrays (views into cp_distribution, no copy)"""
+        if self.cp_distribution is None:
+            return None
+        x, y, cp = self.cp_distribution.T
+        return x, y, cp
+
+
+@lru_cache(maxsize=64)
+def _oper_script(reynolds: float, mach: float, n_crit: float, viscous: bool, max_iter: int) -> bytes:
+    """Encoded commands that enter OPER and set the flow condition (same for every alpha)"""
+    if viscous:
+        commands = [
+            "OPER",
+            f"VISC {reynolds}",  # Enable viscous mode
+            f"M {mach}",  # Set Mach number
+            f"VPAR",
+            f"N {n_crit}",  # Set N_crit
+            "",  # Exit VPAR
+            f"ITER {max_iter}",  # Set max iterations
+        ]
+    else:
+        commands = ["OPER"]
+    return ("\n".join(commands) + "\n").encode()
+
+
+@lru_cache(maxsize=16)
+def _xfoil_available(path: str) -> bool:
+    """Whether an XFoil executable exists at path or on PATH (no process is started)"""
+    return shutil.which(path) is not None or os.access(path, os.X_OK)
+
+
+# One semaphore per event loop: a Semaphore binds to the first loop that
+# waits on it, so sharing one would break the next asyncio.run(). (A bound
+# semaphore references its loop, so weak keys would never expire; closed
+# loops are dropped instead.)
+_async_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+
+def _async_slots() -> asyncio.Semaphore:
+    """Cap on concurrent XFoil runs started from async code on the running loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _async_semaphores.get(loop)
+    if semaphore is None:
+        for closed in [other for other in _async_semaphores if other.is_closed()]:
+            del _async_semaphores[closed]
+        semaphore = _async_semaphores[loop] = asyncio.Semaphore(os.cpu_count() or 1)
+    return semaphore
+
 
 class XFoilWrapper:
     """
     Wrapper class for XFoil inviscid and viscous airfoil analysis
 
-    XFoil must be installed and accessible in PATH or specified via xfoil_path
+    XFoil must be installed and accessible in PATH or specified via xfoil_path,
+    unless the `xfoil` Python package is available (used by default)
     Download: https://web.mit.edu/drela/Public/web/xfoil/
     """
 
@@ -41,14 +123,35 @@ class XFoilWrapper:
         self,
         xfoil_path: str = "xfoil",
         max_iter: int = 100,
-        timeout: int = 60
+        timeout: int = 60,
+        use_subprocess: bool = False,
+        strict_check: bool = False
     ):
         self.xfoil_path = xfoil_path
         self.max_iter = max_iter
         self.timeout = timeout
-
-        # Verify XFoil is available
-        if not self._check_xfoil():
+        self.in_process = XFoil is not None and not use_subprocess
+        # Scratch files (airfoil, polar, Cp) are tiny and short-lived; keep
+        # them on tmpfs where available so they never touch a disk
+        self._scratch_root = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
+        # Airfoils already paneled by XFoil (PANE output saved with SAVE),
+        # keyed by raw coordinate bytes; the directory lives as long as the wrapper
+        self._panel_cache: Dict[bytes, Path] = {}
+        self._panel_dir = None
+        self._panel_lock = threading.Lock()  # run_polar shards share the cache
+
+        # XFoil is deterministic for a given geometry and condition, so
+        # repeated run_analysis calls are answered from memory
+        self._results: LRUCache = LRUCache(maxsize=MAX_RESULT_CACHE)
+        self._results_lock = threading.Lock()
+        if not self.in_process:
+            self._panel_dir = tempfile.TemporaryDirectory(dir=self._scratch_root, prefix="xfoil_panels_")
+
+        # Verify XFoil is available; strict_check also starts it once to be sure it runs
+        if not self.in_process and not (
+            self._check_xfoil() if strict_check else _xfoil_available(xfoil_path)
+        ):
             raise RuntimeError(
                 f"XFoil not found at {xfoil_path}. "
                 "Please install XFoil or specify correct path."
@@ -63,7 +166,7 @@ class XFoilWrapper:
                 capture_output=True,
                 timeout=5
             )
-            return result.returncode == 0 or "XFOIL" in result.stdout.decode()
+            return result.returncode == 0 or b"XFOIL" in result.stdout
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
 
@@ -74,7 +177,8 @@ class XFoilWrapper:
         reynolds: float = 1e6,
         mach: float = 0.0,
         n_crit: float = 9.0,
-        viscous: bool = True
+        viscous: bool = True,
+        need_cp: bool = False
     ) -> XFoilResults:
         """
         Run XFoil analysis for a single angle of attack
@@ -86,62 +190,78 @@ class XFoilWrapper:
             mach: Mach number
             n_crit: Critical amplification factor (9.0 for wind tunnel, 5.0 for flight)
             viscous: Enable viscous analysis (if False, uses inviscid)
+            need_cp: Also write and parse the Cp distribution
 
         Returns:
-            XFoilResults object with simulation data
+            XFoilResults object with simulation data (shared between identical
+            calls; its cp_distribution is read-only)
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir_path = Path(tmpdir)
+        key = (
+            np.ascontiguousarray(airfoil_coords, dtype=np.float64).tobytes(),
+            float(alpha), float(reynolds), float(mach), float(n_crit), viscous, need_cp
+        )
+        with self._results_lock:
+            cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._run_analysis_uncached(airfoil_coords, alpha, reynolds, mach, n_crit, viscous, need_cp)
+
+        # Failures may be timeouts rather than physics, so only successes are kept
+        if result.converged:
+            if result.cp_distribution is not None:
+                result.cp_distribution.setflags(write=False)
+            with self._results_lock:
+                self._results[key] = result
+        return result
+
+    def _run_analysis_uncached(
+        self,
+        airfoil_coords: np.ndarray,
+        alpha: float,
+        reynolds: float,
+        mach: float,
+        n_crit: float,
+        viscous: bool,
+        need_cp: bool
+    ) -> XFoilResults:
+        """Run one alpha with whichever backend is active"""
+        if self.in_process:
+            return self._run_in_process(airfoil_coords, [alpha], reynolds, mach, n_crit, viscous, need_cp)[0]
 
-            # Write airfoil coordinates to file
-            airfoil_file = tmpdir_path / "airfoil.dat"
-            self._write_airfoil_file(airfoil_coords, airfoil_file)
+        # A one-alpha sweep: PACC only records converged points, so the
+        # polar file alone says whether the run converged
+        results = self._run_sweep(airfoil_coords, np.array([float(alpha)]), reynolds, mach, n_crit, viscous, need_cp)
+        if results:
+            return results[0]
 
-            # Prepare output files
-            polar_file = tmpdir_path / "polar.txt"
-            cp_file = tmpdir_path / "cp.txt"
-
-            # Generate XFoil command script
-            commands = self._generate_commands(
-                airfoil_file=str(airfoil_file),
-                polar_file=str(polar_file),
-                cp_file=str(cp_file),
-                alpha=alpha,
-                reynolds=reynolds,
-                mach=mach,
-                n_crit=n_crit,
-                viscous=viscous
-            )
+        return XFoilResults(
+            alpha=alpha,
+            cl=0.0,
+            cd=0.0,
+            cdp=0.0,
+            cm=0.0,
+            top_xtr=0.0,
+            bot_xtr=0.0,
+            converged=False
+        )
 
-            # Run XFoil
-            try:
-                result = subprocess.run(
-                    [self.xfoil_path],
-                    input=commands.encode(),
-                    capture_output=True,
-                    timeout=self.timeout,
-                    cwd=tmpdir
-                )
+    async def run_analysis_async(self, airfoil_coords: np.ndarray, alpha: float, **kwargs) -> XFoilResults:
+        """
+        run_analysis for async callers
 
-                # Parse results
-                return self._parse_results(
-                    polar_file=polar_file,
-                    cp_file=cp_file,
-                    stdout=result.stdout.decode(),
-                    alpha=alpha
-                )
+        The XFoil process is waited on in a worker thread (the wait releases
+        the GIL), so many analyses can be in flight from one event loop; at
+        most one per CPU runs at a time.
+        """
+        async with _async_slots():
+            return await asyncio.to_thread(self.run_analysis, airfoil_coords, alpha, **kwargs)
 
-            except subprocess.TimeoutExpired:
-                return XFoilResults(
-                    alpha=alpha,
-                    cl=0.0,
-                    cd=0.0,
-                    cdp=0.0,
-                    cm=0.0,
-                    top_xtr=0.0,
-                    bot_xtr=0.0,
-                    converged=False
-                )
+    async def gather_analyses(self, airfoil_coords: np.ndarray, alphas, **kwargs) -> List[XFoilResults]:
+        """Run independent single-alpha analyses concurrently, results in alpha order"""
+        return list(await asyncio.gather(
+            *(self.run_analysis_async(airfoil_coords, float(alpha), **kwargs) for alpha in alphas)
+        ))
 
     def run_polar(
         self,
@@ -152,158 +272,283 @@ class XFoilWrapper:
         reynolds: float = 1e6,
         mach: float = 0.0,
         n_crit: float = 9.0,
-        viscous: bool = True
+        viscous: bool = True,
+        workers: Optional[int] = None,
+        need_cp: bool = False
     ) -> List[XFoilResults]:
         """
         Run XFoil polar analysis over a range of angles of attack
 
+        With the XFoil executable, the sweep is split into contiguous
+        sub-ranges run by parallel XFoil processes (up to `workers`, default
+        one per CPU); each process still warm-starts within its sub-range.
+        By default each sub-range is a single native ASEQ and no Cp
+        distributions are written or parsed; see run_polar_with_cp.
+
         Returns:
             List of XFoilResults for each converged angle
         """
-        results = []
         alpha_range = np.arange(alpha_start, alpha_end + alpha_step, alpha_step)
 
-        for alpha in alpha_range:
-            result = self.run_analysis(
-                airfoil_coords=airfoil_coords,
-                alpha=alpha,
-                reynolds=reynolds,
-                mach=mach,
-                n_crit=n_crit,
-                viscous=viscous
+        # Either way the sweep runs in one loaded session, so each solve
+        # starts from the previous converged boundary layer
+        if self.in_process:
+            results = self._run_in_process(airfoil_coords, alpha_range, reynolds, mach, n_crit, viscous, need_cp)
+            return [r for r in results if r.converged]
+
+        workers = workers or os.cpu_count() or 1
+        n_shards = max(1, min(workers, len(alpha_range) // MIN_ALPHAS_PER_SHARD))
+        if n_shards == 1:
+            return self._run_sweep(airfoil_coords, alpha_range, reynolds, mach, n_crit, viscous, need_cp)
+
+        # XFoil runs as separate processes, so threads are enough to keep
+        # every core busy; shard results come back in alpha order
+        shards = np.array_split(alpha_range, n_shards)
+        with ThreadPoolExecutor(max_workers=n_shards) as pool:
+            shard_results = pool.map(
+                lambda shard: self._run_sweep(airfoil_coords, shard, reynolds, mach, n_crit, viscous, need_cp),
+                shards
             )
-            if result.converged:
-                results.append(result)
+            return [r for results in shard_results for r in results]
 
-        return results
-
-    def _write_airfoil_file(self, coords: np.ndarray, filepath: Path):
-        """Write airfoil coordinates to XFoil format"""
-        with open(filepath, 'w') as f:
-            f.write("Airfoil\n")  # Name line
-            for x, y in coords:
-                f.write(f"{x:10.6f} {y:10.6f}\n")
+    def run_polar_with_cp(self, airfoil_coords: np.ndarray, alpha_start: float, alpha_end: float, **kwargs) -> List[XFoilResults]:
+        """run_polar that also returns the Cp distribution for every converged angle"""
+        return self.run_polar(airfoil_coords, alpha_start, alpha_end, need_cp=True, **kwargs)
 
-    def _generate_commands(
+    def _run_sweep(
         self,
-        airfoil_file: str,
-        polar_file: str,
-        cp_file: str,
-        alpha: float,
+        airfoil_coords: np.ndarray,
+        alphas: np.ndarray,
         reynolds: float,
         mach: float,
         n_crit: float,
-        viscous: bool
-    ) -> str:
-        """Generate XFoil command script"""
-        commands = [
-            f"LOAD {airfoil_file}",  # Load airfoil
-            "",  # Confirm name
-            "PANE",  # Re-panel for better distribution
-        ]
+        viscous: bool,
+        need_cp: bool = False
+    ) -> List[XFoilResults]:
+        """
+        Run every alpha in a single XFoil process
 
-        if viscous:
+        The airfoil is loaded, paneled and set up once; converged points are
+        accumulated into one polar file (PACC). With need_cp each alpha is an
+        ALFA plus its own Cp file, otherwise the evenly spaced alphas run as
+        one ASEQ. Returns only converged results.
+        """
+        with tempfile.TemporaryDirectory(dir=self._scratch_root) as tmpdir:
+            tmpdir_path = Path(tmpdir)
+
+            panel_key, airfoil_file, paneled = self._airfoil_source(airfoil_coords, tmpdir_path)
+            saved_panels = tmpdir_path / "paneled.dat"
+
+            polar_file = tmpdir_path / "polar.txt"
+            cp_files = [tmpdir_path / f"cp_{i}.txt" for i in range(len(alphas))]
+
+            load = self._load_commands(str(airfoil_file), paneled=paneled, save_panels=str(saved_panels))
+            commands = [
+                "PACC",  # Accumulate converged points
+                str(polar_file),
+                "",  # No dump file
+            ]
+            if need_cp or len(alphas) < 2:
+                for alpha, cp_file in zip(alphas, cp_files):
+                    commands.append(f"ALFA {alpha}")
+                    if need_cp:
+                        commands.append(f"CPWR {cp_file}")
+            else:
+                # XFoil steps through the sweep itself
+                commands.append(f"ASEQ {alphas[0]} {alphas[-1]} {alphas[1] - alphas[0]}")
             commands.extend([
-                "OPER",
-                f"VISC {reynolds}",  # Enable viscous mode
-                f"M {mach}",  # Set Mach number
-                f"VPAR",
-                f"N {n_crit}",  # Set N_crit
-                "",  # Exit VPAR
-                f"ITER {self.max_iter}",  # Set max iterations
+                "PACC",  # Stop accumulating (closes the polar file)
+                "",  # Leave OPER
+                "QUIT"
             ])
-        else:
-            commands.append("OPER")
 
-        commands.extend([
-            f"ALFA {alpha}",  # Set angle of attack
-            f"CPWR {cp_file}",  # Write Cp distribution
-            f"PWRT",  # Write polar to file
-            f"{polar_file}",
-            "",  # Overwrite if exists
-            "QUIT"
-        ])
-
-        return "\n".join(commands) + "\n"
+            # Only the LOAD lines and the alpha tail vary per run; the OPER
+            # setup for a flow condition is encoded once and reused
+            script = b"".join([
+                ("\n".join(load) + "\n").encode(),
+                _oper_script(float(reynolds), float(mach), float(n_crit), viscous, self.max_iter),
+                ("\n".join(commands) + "\n").encode(),
+            ])
 
-    def _parse_results(
+            try:
+                # Results come from the files; XFoil's console log (often
+                # hundreds of KB of iteration output) is discarded unread
+                subprocess.run(
+                    [self.xfoil_path],
+                    input=script,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=self.timeout * max(len(alphas), 1),
+                    cwd=tmpdir
+                )
+            except subprocess.TimeoutExpired:
+                return []
+            self._store_panels(panel_key, saved_panels)
+
+            if not polar_file.exists():
+                return []
+
+            # Only converged points are written to an accumulated polar; match
+            # each row back to the requested alpha (XFoil prints 3 decimals)
+            results = []
+            for row_alpha, cl, cd, cdp, cm, top_xtr, bot_xtr in self._parse_polar_rows(polar_file):
+                i = int(np.argmin(np.abs(alphas - row_alpha)))
+                results.append(XFoilResults(
+                    alpha=float(alphas[i]),
+                    cl=cl,
+                    cd=cd,
+                    cdp=cdp,
+                    cm=cm,
+                    top_xtr=top_xtr,
+                    bot_xtr=bot_xtr,
+                    converged=True,
+                    cp_distribution=self._parse_cp_file(cp_files[i]) if need_cp and cp_files[i].exists() else None
+                ))
+            return results
+
+    def _run_in_process(
         self,
-        polar_file: Path,
-        cp_file: Path,
-        stdout: str,
-        alpha: float
-    ) -> XFoilResults:
-        """Parse XFoil output files"""
+        airfoil_coords: np.ndarray,
+        alphas,
+        reynolds: float,
+        mach: float,
+        n_crit: float,
+        viscous: bool,
+        need_cp: bool = False
+    ) -> List[XFoilResults]:
+        """Run alphas through the compiled XFoil library (no files, no subprocess)"""
+        global _inprocess_xfoil
 
-        # Check convergence from stdout
-        converged = "VISCAL:  Convergence failed" not in stdout
+        coords = np.asarray(airfoil_coords, dtype=np.float64)
+        results = []
+        with _inprocess_lock:
+            if _inprocess_xfoil is None:
+                _inprocess_xfoil = XFoil()
+            xf = _inprocess_xfoil
+
+            xf.airfoil = Airfoil(coords[:, 0], coords[:, 1])
+            xf.repanel()  # Same as PANE in the command script
+            xf.Re = reynolds if viscous else 0
+            xf.M = mach
+            xf.n_crit = n_crit
+            xf.max_iter = self.max_iter
+
+            for alpha in alphas:
+                cl, cd, cm, _ = xf.a(float(alpha))
+                # Unconverged points come back as NaN
+                converged = not np.isnan(cl)
+                cp_distribution = None
+                if converged and need_cp:
+                    x, y, cp = xf.get_cp_distribution()
+                    cp_distribution = np.column_stack([x, y, cp]).astype(np.float32, copy=False)
+                results.append(XFoilResults(
+                    alpha=float(alpha),
+                    cl=float(cl) if converged else 0.0,
+                    cd=float(cd) if converged else 0.0,
+                    # Not exposed by the library interface
+                    cdp=float("nan"),
+                    cm=float(cm) if converged else 0.0,
+                    top_xtr=float("nan"),
+                    bot_xtr=float("nan"),
+                    converged=converged,
+                    cp_distribution=cp_distribution
+                ))
+        return results
 
-        # Parse polar file
-        if polar_file.exists() and converged:
-            polar_data = self._parse_polar_file(polar_file)
-            if polar_data:
-                cl, cd, cdp, cm, top_xtr, bot_xtr = polar_data
-            else:
-                converged = False
-                cl = cd = cdp = cm = top_xtr = bot_xtr = 0.0
-        else:
-            converged = False
-            cl = cd = cdp = cm = top_xtr = bot_xtr = 0.0
+    def _airfoil_source(self, coords: np.ndarray, tmpdir_path: Path) -> Tuple[bytes, Path, bool]:
+        """
+        Pick the file XFoil should LOAD for these coordinates
 
-        # Parse Cp distribution
-        cp_distribution = None
-        if cp_file.exists() and converged:
-            cp_distribution = self._parse_cp_file(cp_file)
+        Returns (cache key, path, already paneled). Unseen geometries are
+        written raw into the run's scratch directory.
+        """
+        key = np.ascontiguousarray(coords, dtype=np.float64).tobytes()
+        cached = self._panel_cache.get(key)
+        if cached is not None and cached.exists():
+            return key, cached, True
+
+        airfoil_file = tmpdir_path / "airfoil.dat"
+        self._write_airfoil_file(coords, airfoil_file)
+        return key, airfoil_file, False
+
+    def _store_panels(self, key: bytes, saved_panels: Path):
+        """Keep a run's SAVEd paneled airfoil for later runs of the same geometry"""
+        if not saved_panels.exists():
+            return
+        with self._panel_lock:
+            if key in self._panel_cache:
+                return
+            if len(self._panel_cache) >= MAX_PANEL_CACHE:
+                oldest = next(iter(self._panel_cache))
+                self._panel_cache.pop(oldest).unlink(missing_ok=True)
+
+            target = Path(self._panel_dir.name) / f"{hashlib.sha1(key).hexdigest()}.dat"
+            os.replace(saved_panels, target)
+            self._panel_cache[key] = target
 
-        return XFoilResults(
-            alpha=alpha,
-            cl=cl,
-            cd=cd,
-            cdp=cdp,
-            cm=cm,
-            top_xtr=top_xtr,
-            bot_xtr=bot_xtr,
-            converged=converged,
-            cp_distribution=cp_distribution
-        )
+    def _write_airfoil_file(self, coords: np.ndarray, filepath: Path):
+        """Write airfoil coordinates to XFoil format"""
+        values = np.asarray(coords, dtype=np.float64).ravel().tolist()
+        # Name line, then every "x y" row formatted in one % operation and
+        # written with a single call
+        buf = b"Airfoil\n" + (b"%10.6f %10.6f\n" * (len(values) // 2)) % tuple(values)
+        with open(filepath, 'wb') as f:
+            f.write(buf)
+
+    def _load_commands(
+        self,
+        airfoil_file: str,
+        paneled: bool = False,
+        save_panels: Optional[str] = None
+    ) -> List[str]:
+        """
+        Commands that load and panel the airfoil
 
-    def _parse_polar_file(self, filepath: Path) -> Optional[Tuple[float, ...]]:
-        """Parse polar file to extract aerodynamic coefficients"""
+        A file that XFoil already paneled is loaded as-is; otherwise PANE
+        runs and, if save_panels is given, the paneled airfoil is saved there.
+        """
+        commands = [
+            f"LOAD {airfoil_file}",  # Load airfoil
+            "",  # Confirm name
+        ]
+        if not paneled:
+            commands.append("PANE")  # Re-panel for better distribution
+            if save_panels:
+                commands.append(f"SAVE {save_panels}")
+        return commands
+
+    @staticmethod
+    def _parse_polar_rows(filepath: Path) -> List[Tuple[float, ...]]:
+        """Parse every data row of a polar file as (alpha, CL, CD, CDp, CM, Top_Xtr, Bot_Xtr)"""
         try:
-            with open(filepath, 'r') as f:
+            with open(filepath, 'rb') as f:
                 lines = f.readlines()
-
-            # Find data line (skip header)
-            for line in lines:
-                if line.strip() and not line.startswith('-'):
-                    # Format: alpha CL CD CDp CM Top_Xtr Bot_Xtr
-                    parts = line.split()
-                    if len(parts) >= 7:
-                        _, cl, cd, cdp, cm, top_xtr, bot_xtr = map(float, parts[:7])
-                        return cl, cd, cdp, cm, top_xtr, bot_xtr
+            # The header (including " 1 1 Reynolds number fixed ...", which
+            # starts with digits) ends at the dashed rule under the column names
+            rule = next(
+                (i for i in range(len(lines) - 1, -1, -1) if lines[i].lstrip().startswith(b"---")),
+                None
+            )
+            if rule is None:
+                return []
+            data_lines = [line for line in lines[rule + 1:] if line.strip()]
+            if not data_lines:
+                return []
+            # Numeric rows go to NumPy's C parser in one call
+            data = np.loadtxt(data_lines, usecols=range(7), ndmin=2)
+            return [tuple(row) for row in data.tolist()]
         except Exception as e:
             print(f"Error parsing polar file: {e}")
 
-        return None
+        return []
 
     def _parse_cp_file(self, filepath: Path) -> Optional[np.ndarray]:
         """Parse Cp distribution file"""
         try:
-            with open(filepath, 'r') as f:
-                lines = f.readlines()
-
-            # Skip header lines
-            data_lines = [l for l in lines if not l.strip().startswith('#')]
-
-            # Parse x, y, Cp columns
-            data = []
-            for line in data_lines:
-                parts = line.split()
-                if len(parts) >= 3:
-                    x, y, cp = map(float, parts[:3])
-                    data.append([x, y, cp])
-
-            return np.array(data) if data else None
+            # x, y, Cp columns parsed in C; '#' header lines are skipped.
+            # CPWR prints 5 significant digits, which float32 holds exactly
+            data = np.loadtxt(filepath, comments='#', usecols=(0, 1, 2), ndmin=2, dtype=np.float32)
+            return data if data.size else None
 
         except Exception as e:
             print(f"Error parsing Cp file: {e}")
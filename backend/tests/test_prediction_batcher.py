@@ -0,0 +1,86 @@
+"""
+Micro-batching of single-point predictions
+"""
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services import prediction_batcher as batcher_module
+from app.services.prediction_batcher import PredictionBatcher
+
+
+class FakePredictor:
+    def __init__(self):
+        self.calls = []
+
+    def predict_many(self, coordinates, alphas, reynolds):
+        self.calls.append((coordinates, list(alphas), list(reynolds)))
+        return [{"CL": alpha, "Re": re} for alpha, re in zip(alphas, reynolds)]
+
+
+@pytest.fixture
+def predictor(monkeypatch):
+    fake = FakePredictor()
+    monkeypatch.setattr(batcher_module, "get_predictor", lambda: fake)
+    return fake
+
+
+def test_groups_concurrent_calls_by_airfoil(predictor):
+    a = np.zeros((3, 2))
+    b = np.ones((3, 2))
+
+    async def main():
+        batcher = PredictionBatcher(window_ms=50)
+        try:
+            return await asyncio.gather(
+                batcher.predict(a, 1.0, 1e6),
+                batcher.predict(b, 2.0, 1e6),
+                batcher.predict(a, 3.0, 2e6),
+            )
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(main())
+
+    assert [r["CL"] for r in results] == [1.0, 2.0, 3.0]
+    assert len(predictor.calls) == 2
+    calls = {id(coords): (alphas, reynolds) for coords, alphas, reynolds in predictor.calls}
+    assert calls[id(a)] == ([1.0, 3.0], [1e6, 2e6])
+    assert calls[id(b)] == ([2.0], [1e6])
+
+
+def test_predictor_error_reaches_callers_and_worker_survives(monkeypatch):
+    def broken():
+        raise RuntimeError("model failed to load")
+
+    async def main():
+        batcher = PredictionBatcher(window_ms=1)
+        try:
+            monkeypatch.setattr(batcher_module, "get_predictor", broken)
+            with pytest.raises(RuntimeError, match="model failed to load"):
+                await batcher.predict(np.zeros((3, 2)), 1.0, 1e6)
+            worker = batcher._worker
+
+            fake = FakePredictor()
+            monkeypatch.setattr(batcher_module, "get_predictor", lambda: fake)
+            result = await batcher.predict(np.zeros((3, 2)), 2.0, 1e6)
+            assert batcher._worker is worker
+            return result
+        finally:
+            await batcher.close()
+
+    assert asyncio.run(main())["CL"] == 2.0
+
+
+def test_close_cancels_waiting_predictions(predictor):
+    async def main():
+        batcher = PredictionBatcher(window_ms=10_000)
+        task = asyncio.ensure_future(batcher.predict(np.zeros((3, 2)), 1.0, 1e6))
+        await asyncio.sleep(0.01)
+        await batcher.close()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert predictor.calls == []
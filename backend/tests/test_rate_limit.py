@@ -0,0 +1,131 @@
+"""
+Fixed-window rate limiter, with and without Redis
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core import cache
+
+
+class FakePipeline:
+    """Queues SET NX EX / INCR and applies them on execute(), like MULTI/EXEC"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None, nx=False):
+        self.queued.append(("set", key, value, ex, nx))
+        return self
+
+    def incr(self, key):
+        self.queued.append(("incr", key))
+        return self
+
+    async def execute(self):
+        results = []
+        for command in self.queued:
+            if command[0] == "set":
+                _, key, value, ex, nx = command
+                if nx and key in self.redis.counts:
+                    results.append(None)
+                    continue
+                self.redis.counts[key] = value
+                self.redis.expiry[key] = ex
+                results.append(True)
+            else:
+                key = command[1]
+                self.redis.counts[key] = self.redis.counts.get(key, 0) + 1
+                results.append(self.redis.counts[key])
+        self.queued = []
+        return results
+
+
+class FakeRedis:
+    """Just the pipeline subset rate_limit uses"""
+
+    def __init__(self):
+        self.counts = {}
+        self.expiry = {}
+
+    def pipeline(self, transaction=True):
+        assert transaction
+        return FakePipeline(self)
+
+
+def _hit(client_id, limit=2, window=60):
+    asyncio.run(cache.rate_limit(client_id, "test", limit, window))
+
+
+@pytest.fixture
+def local_counters(monkeypatch):
+    monkeypatch.setattr(cache, "get_redis", lambda: None)
+    monkeypatch.setattr(cache, "_local_counters", {})
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(cache, "get_redis", lambda: redis)
+    return redis
+
+
+def test_local_limit_per_client(local_counters):
+    _hit("10.0.0.1")
+    _hit("10.0.0.1")
+    with pytest.raises(HTTPException) as exc:
+        _hit("10.0.0.1")
+    assert exc.value.status_code == 429
+
+    # Other clients have their own window
+    _hit("10.0.0.2")
+
+
+def test_local_zero_limit_disables(local_counters):
+    for _ in range(10):
+        _hit("10.0.0.1", limit=0)
+
+
+def test_redis_limit_sets_ttl_with_first_count(fake_redis):
+    _hit("10.0.0.1", window=3600)
+    # The TTL is set in the same transaction as the first increment
+    assert fake_redis.expiry == {"rl:test:10.0.0.1": 3600}
+    _hit("10.0.0.1", window=3600)
+    with pytest.raises(HTTPException):
+        _hit("10.0.0.1", window=3600)
+
+    assert fake_redis.counts == {"rl:test:10.0.0.1": 3}
+    assert fake_redis.expiry == {"rl:test:10.0.0.1": 3600}
+
+
+def test_redis_limit_per_client(fake_redis):
+    _hit("10.0.0.1")
+    _hit("10.0.0.2")
+    assert set(fake_redis.counts) == {"rl:test:10.0.0.1", "rl:test:10.0.0.2"}
+
+
+def _request(forwarded_for=None):
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": ("10.9.9.9", 443)})
+
+
+def test_client_address_ignores_forwarded_for_by_default(monkeypatch):
+    monkeypatch.setattr(cache, "settings", SimpleNamespace(TRUSTED_PROXY_HOPS=0))
+    assert cache.client_address(_request("1.2.3.4")) == "10.9.9.9"
+
+
+def test_client_address_uses_hop_added_by_own_proxy(monkeypatch):
+    monkeypatch.setattr(cache, "settings", SimpleNamespace(TRUSTED_PROXY_HOPS=1))
+    # The client forged the leftmost entry; the proxy appended the real one
+    assert cache.client_address(_request("1.2.3.4, 203.0.113.7")) == "203.0.113.7"
+    assert cache.client_address(_request()) == "10.9.9.9"
@@ -0,0 +1,44 @@
+"""
+Polar file parsing against output written by XFoil 6.99 (PACC)
+"""
+import pytest
+
+from app.utils.xfoil_wrapper import XFoilWrapper
+
+
+POLAR_FILE = b"""\
+ 
+       XFOIL         Version 6.99
+ 
+ Calculated polar for: NACA 2412                                       
+ 
+ 1 1 Reynolds number fixed          Mach number fixed         
+ 
+ xtrf =   1.000 (top)        1.000 (bottom)  
+ Mach =   0.000     Re =     1.000 e 6     Ncrit =   9.000
+ 
+   alpha    CL        CD       CDp       CM     Top_Xtr  Bot_Xtr
+  ------ -------- --------- --------- -------- -------- --------
+  -2.000   0.0299   0.00575   0.00094  -0.0531   0.6907   0.3330
+   0.000   0.2500   0.00558   0.00093  -0.0547   0.6034   0.5287
+   2.000   0.4672   0.00590   0.00114  -0.0562   0.5149   0.8106
+"""
+
+
+def test_parse_polar_rows_skips_header(tmp_path):
+    polar = tmp_path / "polar.txt"
+    polar.write_bytes(POLAR_FILE)
+
+    rows = XFoilWrapper._parse_polar_rows(polar)
+
+    assert len(rows) == 3
+    assert [row[0] for row in rows] == [-2.0, 0.0, 2.0]
+    assert rows[1] == pytest.approx((0.0, 0.25, 0.00558, 0.00093, -0.0547, 0.6034, 0.5287))
+
+
+def test_parse_polar_rows_header_only(tmp_path):
+    # Nothing converged: XFoil still writes the full header
+    polar = tmp_path / "polar.txt"
+    polar.write_bytes(POLAR_FILE.split(b"  -2.000")[0])
+
+    assert XFoilWrapper._parse_polar_rows(polar) == []